@@ -6,15 +6,26 @@ Featuring: Progress bars, batch processing, ASCII art, and more!
 """
 
 import argparse
+import asyncio
+import atexit
+import contextlib
+import functools
 import glob
+import itertools
 import json
 import os
 import re
+import shutil
 import subprocess
 import sys
+import tempfile
+import threading
 import time
+import types
+import weakref
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, FrozenSet
 
 try:
     from rich.console import Console
@@ -23,6 +34,7 @@ try:
     from rich.table import Table
     from rich.text import Text
     from rich.align import Align
+    from rich.markup import escape
     from rich import print as rprint
     RICH_AVAILABLE = True
 except ImportError:
@@ -36,14 +48,239 @@ try:
 except ImportError:
     FIGLET_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import av
+    AV_AVAILABLE = True
+except ImportError:
+    AV_AVAILABLE = False
+
+# Video encoder rows in `ffmpeg -encoders` look like " V....D h264_nvenc   NVIDIA NVENC ..."
+_VIDEO_ENCODER_LINE = re.compile(r'^\s*V[.\w]*\s+(\w+)\s', re.M)
+
+# Filter rows in `ffmpeg -filters` look like " ... scale_npp         V->V       NVIDIA ..."
+_FILTER_LINE = re.compile(r'^\s*[.\w|]{3}\s+(\w+)\s+\S+->\S+', re.M)
+
+# Option rows in `ffmpeg -h encoder=...` look like "  -surfaces          <int>   E..V....... ..."
+_ENCODER_OPTION_LINE = re.compile(r'^\s+-(\w[\w-]*)\s', re.M)
+
+# Outputs estimated above this size are written as fragmented MP4 to skip the faststart rewrite
+_FRAGMENTED_MP4_THRESHOLD = 100 * 1024 * 1024
+
+# NVENC pipeline depth: more surfaces, buffered output and lookahead keep the encoder busy
+_NVENC_PIPELINE_OPTIONS = (('surfaces', '64'), ('delay', '16'), ('rc-lookahead', '32'))
+
+# Extra NVENC quality for the hq-tuned tiers: B-frames used as references, on top of the
+# lookahead and AQ every tier gets (single pass, so GPU time stays about the same).
+# -bf is a generic codec option, so only the NVENC-private b_ref_mode is checked for.
+_NVENC_HQ_OPTIONS = (('b_ref_mode', 'middle'),)
+
+# Probe results kept between runs, as {abspath: [mtime_ns, size, info]} (least recently used first).
+# Bump the version whenever the info dict changes shape, so older caches are dropped
+_PROBE_CACHE_PATH = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'video-cleaner' / 'probe.json'
+_PROBE_CACHE_LIMIT = 4096
+_PROBE_CACHE_VERSION = 2
+
+# A source within this factor of a preset's total bitrate is remuxed instead of re-encoded
+_COPY_BITRATE_TOLERANCE = 1.1
+
+# Render node used for VAAPI decode, upload and encode
+_VAAPI_DEVICE = '/dev/dri/renderD128'
+
+# Buffer limit for the ffmpeg progress stream, and the size of each read from it
+_PIPE_BUFSIZE = 1 << 20
+_PIPE_READ_SIZE = 1 << 16
+
+
+# How much of FFmpeg's stderr to show for error messages
+_STDERR_TAIL_BYTES = 4096
+
+
+def _last_progress_time(block):
+    """Return the newest out_time_us in a block of complete `-progress` lines, in seconds
+
+    Only the latest position matters, so the block is searched from the end instead of
+    being split and parsed line by line.
+    """
+    end = len(block)
+    while True:
+        start = block.rfind(b'out_time_us=', 0, end)
+        if start == -1:
+            return None
+        value = block[start + 12:block.find(b'\n', start)].strip()
+        if value.isdigit():  # "N/A" until the first frame is written
+            return int(value) / 1_000_000
+        end = start
+
+
+def _last_progress_speed(block):
+    """Return the newest `speed=` value in a block of complete `-progress` lines (e.g. '2.4x')"""
+    start = block.rfind(b'speed=')
+    if start == -1:
+        return None
+    value = block[start + 6:block.find(b'\n', start)].strip()
+    return value.decode() if value and value != b'N/A' else None
+
+
+async def _drain_tail(stream):
+    """Read a stream to EOF, keeping only its last _STDERR_TAIL_BYTES"""
+    tail = b''
+    while True:
+        chunk = await stream.read(_PIPE_READ_SIZE)
+        if not chunk:
+            return tail
+        tail = (tail + chunk)[-_STDERR_TAIL_BYTES:]
+
+
+# Enhanced quality presets with emoji descriptions (read-only, shared by every encode)
+_QUALITY_SETTINGS = types.MappingProxyType({
+    "insane": types.MappingProxyType({"crf": "18", "preset": "veryslow", "codec": "libx264", "nvenc_preset": "p6", "nvenc_tune": "hq", "maxrate": "1200k", "bufsize": "2400k", "emoji": "🔥", "desc": "Maximum Quality"}),
+    "high": types.MappingProxyType({"crf": "23", "preset": "slow", "codec": "libx264", "nvenc_preset": "p5", "nvenc_tune": "hq", "maxrate": "800k", "bufsize": "1600k", "emoji": "✨", "desc": "High Quality"}),
+    "medium": types.MappingProxyType({"crf": "28", "preset": "fast", "codec": "libx264", "nvenc_preset": "p3", "nvenc_tune": "ll", "maxrate": "500k", "bufsize": "1000k", "emoji": "⚡", "desc": "Balanced"}),
+    "low": types.MappingProxyType({"crf": "32", "preset": "fast", "codec": "libsvtav1", "svtav1_preset": "10", "svtav1_crf": "40", "nvenc_preset": "p2", "nvenc_tune": "ll", "maxrate": "300k", "bufsize": "600k", "emoji": "🚀", "desc": "Speed Focus"}),
+    "potato": types.MappingProxyType({"crf": "35", "preset": "veryfast", "codec": "libsvtav1", "svtav1_preset": "12", "svtav1_crf": "45", "nvenc_preset": "p1", "nvenc_tune": "ll", "maxrate": "200k", "bufsize": "400k", "emoji": "🥔", "desc": "Tiny Size"})
+})
+
+# CPU encoder arguments for each preset, built once at import and unpacked into every command
+_QUALITY_ARGS = types.MappingProxyType({
+    quality: ('-c:v', 'libx264', '-preset', settings['preset'], '-crf', settings['crf'],
+              '-maxrate', settings['maxrate'], '-bufsize', settings['bufsize'])
+    for quality, settings in _QUALITY_SETTINGS.items()
+})
+
+# SVT-AV1 arguments for the presets that prefer it (used when FFmpeg has libsvtav1)
+_SVTAV1_ARGS = types.MappingProxyType({
+    quality: ('-c:v', 'libsvtav1', '-preset', settings['svtav1_preset'], '-crf', settings['svtav1_crf'], '-g', '240',
+              '-maxrate', settings['maxrate'], '-bufsize', settings['bufsize'])
+    for quality, settings in _QUALITY_SETTINGS.items() if settings['codec'] == 'libsvtav1'
+})
+
+# libx264 -tune values: each switches x264's analysis to suit a kind of content
+_X264_TUNES = frozenset({'film', 'animation', 'grain', 'stillimage', 'psnr', 'ssim', 'fastdecode', 'zerolatency'})
+
+# Valid quality names and the menu's quit words, checked on every interactive prompt
+_QUALITIES = frozenset(_QUALITY_SETTINGS)
+_MENU_QUIT = frozenset({'q', 'quit', 'exit'})
+
+# Relative visual quality of each preset, for the benchmark's quality/time trade-off
+_QSCORE = types.MappingProxyType({'potato': 0, 'low': 1, 'medium': 2, 'high': 3, 'insane': 4})
+
+
+@dataclass(frozen=True)
+class _FFCapabilities:
+    """What the installed FFmpeg build supports, discovered once per process"""
+    version: str
+    encoders: FrozenSet[str]
+    hwaccels: FrozenSet[str]
+    filters: FrozenSet[str]
+
+
+# subprocess launches with posix_spawn instead of fork + exec only for an absolute executable
+# and close_fds=False; Python opens every fd non-inheritable, so children still get just their pipes
+_SPAWN_OPTIONS = types.MappingProxyType({'close_fds': False})
+
+
+@functools.lru_cache(maxsize=None)
+def _executable(name):
+    """Absolute path of a tool on PATH (the bare name if it isn't found)"""
+    return shutil.which(name) or name
+
+
+def _spawn_cmd(cmd):
+    """`cmd` with its program resolved to an absolute path, ready for posix_spawn"""
+    return [_executable(cmd[0]), *cmd[1:]]
+
+
+def _run_ffmpeg_query(*args):
+    """Run an informational ffmpeg command and return its stdout ('' on failure)"""
+    try:
+        result = subprocess.run(_spawn_cmd(['ffmpeg', '-hide_banner', *args]),
+                              capture_output=True, text=True, timeout=10, **_SPAWN_OPTIONS)
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return ''
+    return result.stdout if result.returncode == 0 else ''
+
+
+@functools.lru_cache(maxsize=1)
+def _ff_capabilities():
+    """Query FFmpeg's version, video encoders, hwaccels and filters a single time"""
+    version_output = _run_ffmpeg_query('-version')
+    if not version_output:
+        return _FFCapabilities(version='', encoders=frozenset(), hwaccels=frozenset(), filters=frozenset())
+
+    # `-hwaccels` prints a "Hardware acceleration methods:" header, then one name per line
+    hwaccel_lines = _run_ffmpeg_query('-hwaccels').splitlines()[1:]
+    return _FFCapabilities(
+        version=version_output.splitlines()[0],
+        encoders=frozenset(_VIDEO_ENCODER_LINE.findall(_run_ffmpeg_query('-encoders'))),
+        hwaccels=frozenset(line.strip() for line in hwaccel_lines if line.strip()),
+        filters=frozenset(_FILTER_LINE.findall(_run_ffmpeg_query('-filters')))
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _encoder_options(encoder):
+    """Private options an encoder accepts, parsed once from `ffmpeg -h encoder=<name>`"""
+    return frozenset(_ENCODER_OPTION_LINE.findall(_run_ffmpeg_query('-h', f'encoder={encoder}')))
+
+
+def _fit_box(width, height, max_width, max_height):
+    """Largest even (width, height) inside the box that keeps the source aspect ratio"""
+    scale = min(max_width / width, max_height / height, 1.0)
+    # 4:2:0 encoders need even dimensions
+    return max(2, round(width * scale) // 2 * 2), max(2, round(height * scale) // 2 * 2)
+
+
+# Compressors with a persistent probe cache, saved by one exit hook however many are created
+_PROBE_CACHE_OWNERS = weakref.WeakSet()
+
+
+@atexit.register
+def _save_probe_caches():
+    """Write back the probe cache of every compressor still alive at exit"""
+    for compressor in list(_PROBE_CACHE_OWNERS):
+        compressor._save_probe_cache()
+
 
 class VideoCompressor:
-    def __init__(self):
+    def __init__(self, verify_gpu=False, gpu_concurrency=2, probe_cache_path=_PROBE_CACHE_PATH):
         self.discord_max_size_mb = 25
         self.discord_max_size_bytes = self.discord_max_size_mb * 1024 * 1024
         self.target_bitrate = "500k"
         self.max_resolution = "1280:720"
         self.console = Console() if RICH_AVAILABLE else None
+        self.prefer_gpu = False  # encoder used by the interactive menus (main() sets it from --gpu/--cpu)
+        self.tune = None  # libx264 -tune for CPU encodes (one of _X264_TUNES), None for x264's default
+
+        # Output bound once: the rich console when available, plain stdout/stderr otherwise.
+        # Messages interpolate paths and FFmpeg output, so rich must not parse them as markup
+        # (style= only sets the colour; brackets like [/dev/dri/renderD128] would still parse)
+        if RICH_AVAILABLE:
+            self._print = self._fail = functools.partial(self.console.print, markup=False)
+        else:
+            self._print = lambda message, **_: print(message)
+            self._fail = lambda message, **_: sys.stderr.write(f"{message}\n")
+
+        # GPU encoder detection runs once per compressor and is shared by every encode
+        self.verify_gpu = verify_gpu
+        self._gpu_encoder_cache = None
+        self._gpu_encoder_checked = False
+        self._gpu_lock = threading.Lock()
+        self.gpu_concurrency = gpu_concurrency  # GPU encodes a batch keeps in flight at once
+
+        # ffprobe results as {abspath: ((mtime_ns, size), info)}; a changed file replaces its entry.
+        # Loaded from probe_cache_path (None keeps it in memory only) and written back at exit
+        self._probe_cache_path = probe_cache_path
+        self._probe_cache = self._load_probe_cache()
+        self._probe_cache_dirty = False
+        if probe_cache_path is not None:
+            _PROBE_CACHE_OWNERS.add(self)
+        self._scale_cache = {}
 
         # Cool ASCII art and colors
         self.colors = {
@@ -69,164 +306,256 @@ class VideoCompressor:
                 print("🎬 Ultra Cool Discord Video Compressor 🎬")
         else:
             welcome = "="*60 + "\n" + "🎬 ULTRA COOL DISCORD VIDEO COMPRESSOR 🎬\n" + "="*60
-            if RICH_AVAILABLE:
-                self.console.print(welcome, style="bold cyan")
-            else:
-                print(welcome)
+            self._print(welcome, style="bold cyan")
 
-    def check_ffmpeg(self):
-        """Check if FFmpeg is available"""
-        try:
-            result = subprocess.run(['ffmpeg', '-version'],
-                                  capture_output=True, text=True, timeout=10)
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError):
+    def check_ffmpeg(self, verbose=False):
+        """Check if FFmpeg and FFprobe are on PATH (runs `ffmpeg -version` only when verbose)"""
+        if shutil.which('ffmpeg') is None or shutil.which('ffprobe') is None:
             return False
+        if not verbose:
+            return True
+
+        version = _ff_capabilities().version
+        self._print(f"🔧 {version or 'FFmpeg did not report a version'}", style="cyan")
+        return bool(version)
 
-    def _get_gpu_encoder(self):
-        """Detect and return the best available GPU encoder"""
+    def _get_gpu_encoder(self, verify=None, quiet=False):
+        """Detect and return the best available GPU encoder (cached after the first call)
+
+        The encoder list check is usually enough; pass verify=True (or construct the
+        compressor with verify_gpu=True) to also run a short test encode.
+        `quiet` skips the per-encoder detection messages (used for the startup default).
+        """
+        with self._gpu_lock:
+            if self._gpu_encoder_checked:
+                return self._gpu_encoder_cache
+
+            if verify is None:
+                verify = self.verify_gpu
+            self._gpu_encoder_cache = self._detect_gpu_encoder(verify, quiet)
+            self._gpu_encoder_checked = True
+            return self._gpu_encoder_cache
+
+    def _detect_gpu_encoder(self, verify, quiet=False):
+        """Pick the first supported GPU encoder for this platform that FFmpeg provides"""
         import platform
         system = platform.system().lower()
 
         if system == 'windows':
-            encoders_to_test = ['h264_nvenc']  # Only NVENC on Windows
+            encoders_to_test = ['h264_nvenc', 'h264_qsv']  # NVENC, then Intel Quick Sync
         elif system == 'darwin':
             encoders_to_test = ['h264_videotoolbox']  # Only VideoToolbox on macOS
         else:
-            encoders_to_test = ['h264_nvenc', 'h264_vaapi']  # Both on Linux
+            encoders_to_test = ['h264_nvenc', 'h264_qsv', 'h264_vaapi']
 
-        if RICH_AVAILABLE:
-            self.console.print("🔍 Checking for GPU encoders...", style="cyan")
-        else:
-            print("🔍 Checking for GPU encoders...")
+        say = (lambda message, **_: None) if quiet else self._print
+        say("🔍 Checking for GPU encoders...", style="cyan")
 
-        # First try to check if encoders exist in FFmpeg
-        try:
-            result = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'],
-                                  capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                available_encoders = result.stdout.lower()
-                for encoder in encoders_to_test:
-                    if encoder in available_encoders:
-                        if RICH_AVAILABLE:
-                            self.console.print(f"✅ Found {encoder} in FFmpeg", style="green")
-                        else:
-                            print(f"✅ Found {encoder} in FFmpeg")
-
-                        # Found encoder in list, now test if it actually works
-                        if self._test_gpu_encoder(encoder):
-                            if RICH_AVAILABLE:
-                                self.console.print(f"🚀 {encoder} test successful!", style="bold green")
-                            else:
-                                print(f"🚀 {encoder} test successful!")
-                            return encoder
-                        else:
-                            if RICH_AVAILABLE:
-                                self.console.print(f"❌ {encoder} test failed", style="red")
-                            else:
-                                print(f"❌ {encoder} test failed")
-                    else:
-                        if RICH_AVAILABLE:
-                            self.console.print(f"⚠️ {encoder} not found in FFmpeg", style="yellow")
-                        else:
-                            print(f"⚠️ {encoder} not found in FFmpeg")
-        except (subprocess.TimeoutExpired, FileNotFoundError) as e:
-            if RICH_AVAILABLE:
-                self.console.print(f"❌ Error checking encoders: {e}", style="red")
+        available_encoders = _ff_capabilities().encoders
+        for encoder in encoders_to_test:
+            if encoder not in available_encoders:
+                say(f"⚠️ {encoder} not found in FFmpeg", style="yellow")
+                continue
+
+            say(f"✅ Found {encoder} in FFmpeg", style="green")
+
+            if not verify:
+                return encoder
+
+            # Found encoder in list, now test if it actually works
+            if self._test_gpu_encoder(encoder, quiet):
+                say(f"🚀 {encoder} test successful!", style="bold green")
+                return encoder
             else:
-                print(f"❌ Error checking encoders: {e}")
+                if not quiet:
+                    self._fail(f"❌ {encoder} test failed", style="red")
 
         return None
 
-    def _test_gpu_encoder(self, encoder):
+    def _gpu_batch_parallelism(self):
+        """How many GPU encodes a batch runs at once
+
+        One ffmpeg process rarely saturates a GPU's encode engine, so batches keep
+        `gpu_concurrency` in flight. For NVENC, sessions other programs already hold
+        (reported by nvidia-smi) are taken off that budget.
+        """
+        limit = self.gpu_concurrency
+        if self._get_gpu_encoder() != 'h264_nvenc' or shutil.which('nvidia-smi') is None:
+            return limit
+
+        try:
+            stats = subprocess.run(_spawn_cmd(['nvidia-smi', '-q', '-d', 'ENCODER_STATS']),
+                                   capture_output=True, text=True, timeout=5, **_SPAWN_OPTIONS).stdout
+        except (subprocess.TimeoutExpired, OSError):
+            return limit
+        busy = sum(int(count) for count in re.findall(r'Active Sessions\s*:\s*(\d+)', stats))
+        return max(1, limit - busy)
+
+    def _test_gpu_encoder(self, encoder, quiet=False):
         """Test if a specific GPU encoder actually works with realistic settings"""
-        if RICH_AVAILABLE:
-            self.console.print(f"🧪 Testing {encoder}...", style="cyan")
-        else:
-            print(f"🧪 Testing {encoder}...")
+        say = (lambda message, **_: None) if quiet else self._print
+        say(f"🧪 Testing {encoder}...", style="cyan")
 
         try:
             # Use minimum size that works with all GPU encoders (NVENC needs at least 256x256)
             test_size = '256x256'
 
-            # Build test command with encoder-specific settings (similar to actual usage)
-            test_cmd = [
-                'ffmpeg', '-hide_banner', '-loglevel', 'error',
-                '-f', 'lavfi', '-i', f'testsrc=duration=0.2:size={test_size}:rate=30',
-                '-c:v', encoder
-            ]
-
-            # Add encoder-specific quality settings (matching compress_video logic)
-            if 'nvenc' in encoder:
-                test_cmd.extend(['-preset', 'p4', '-cq', '28'])
-            elif 'vaapi' in encoder:
-                test_cmd.extend(['-qp', '28'])
-            elif 'videotoolbox' in encoder:
-                test_cmd.extend(['-q:v', '22'])
-
-            # Add common settings
-            test_cmd.extend([
-                '-maxrate', '500k', '-bufsize', '1000k',
-                '-frames:v', '5', '-f', 'null', '-'
-            ])
-
-            result = subprocess.run(test_cmd, capture_output=True, timeout=20)
-
-            if RICH_AVAILABLE:
-                self.console.print(f"📊 Test result: return code {result.returncode}", style="blue")
-                if result.stderr:
-                    error_text = result.stderr.decode()[:300]
-                    self.console.print(f"📝 Error output: {error_text}", style="yellow")
-                    # Check for common GPU encoding failures
-                    if any(x in error_text.lower() for x in ['invalid argument', 'not supported', 'failed', 'cannot']):
-                        if RICH_AVAILABLE:
-                            self.console.print(f"🚫 {encoder} appears to have driver/hardware issues", style="red")
-                        else:
-                            print(f"🚫 {encoder} appears to have driver/hardware issues")
-                        return False
-            else:
-                print(f"📊 Test result: return code {result.returncode}")
-                if result.stderr:
-                    error_text = result.stderr.decode()[:300]
-                    print(f"📝 Error output: {error_text}")
+            # Same device setup, filters and encoder settings as a real encode, so VAAPI gets
+            # its device and hwupload and QSV its hwaccel init; only the input is synthetic
+            test_cmd = self._input_args(f'testsrc=duration=0.2:size={test_size}:rate=30', encoder, 1)
+            test_cmd[-2:-2] = ['-f', 'lavfi']
+            test_cmd.extend(self._video_codec_args('medium', encoder))
+            filters = self._video_filters(None, encoder)
+            if filters:
+                test_cmd.extend(['-vf', ','.join(filters)])
+            test_cmd.extend(['-frames:v', '5', '-f', 'null', '-'])
+
+            result = subprocess.run(_spawn_cmd(test_cmd), capture_output=True, timeout=20, **_SPAWN_OPTIONS)
+
+            say(f"📊 Test result: return code {result.returncode}", style="blue")
+            if result.stderr:
+                error_text = result.stderr.decode(errors='replace')[:300]
+                say(f"📝 Error output: {error_text}", style="yellow")
+                # Check for common GPU encoding failures
+                if any(x in error_text.lower() for x in ['invalid argument', 'not supported', 'failed', 'cannot']):
+                    say(f"🚫 {encoder} appears to have driver/hardware issues", style="red")
+                    return False
 
             # Return True only if command succeeded with no critical errors
             return result.returncode == 0
         except (subprocess.TimeoutExpired, FileNotFoundError) as e:
-            if RICH_AVAILABLE:
-                self.console.print(f"❌ Test exception: {e}", style="red")
-            else:
-                print(f"❌ Test exception: {e}")
+            if not quiet:
+                self._fail(f"❌ Test exception: {e}", style="red")
             return False
 
     def get_video_info(self, input_path):
         """Get detailed video information with cool display"""
         if RICH_AVAILABLE:
             with self.console.status("🔍 Analyzing video...", spinner="dots"):
-                time.sleep(0.5)  # Dramatic pause
                 info = self._extract_video_info(input_path)
         else:
             print("🔍 Analyzing video...")
             info = self._extract_video_info(input_path)
 
         if info and RICH_AVAILABLE:
-            self._display_video_info(info, input_path)
+            self._display_video_info(info, input_path, info['file_size'])
         elif info:
-            self._display_video_info_simple(info, input_path)
+            self._display_video_info_simple(info, input_path, info['file_size'])
+
+        return info
 
+    def _extract_video_info(self, input_path, st=None):
+        """Extract video information with PyAV or ffprobe (cached until the file changes)
+
+        Pass `st` when the caller already has the file's os.stat result.
+        """
+        if st is None:
+            try:
+                st = os.stat(input_path)
+            except OSError:
+                return None
+
+        cache_path = os.path.abspath(input_path)
+        signature = (st.st_mtime_ns, st.st_size)
+        cached = self._probe_cache.pop(cache_path, None)
+        if cached and cached[0] == signature:
+            self._probe_cache[cache_path] = cached  # re-insert as most recently used
+            self._probe_cache_dirty = True  # so the new recency order is saved too
+            return cached[1]
+
+        # PyAV reads the container in-process; ffprobe covers anything it can't open
+        info = self._probe_with_av(input_path, st.st_size) if AV_AVAILABLE else None
+        if info is None:
+            info = self._probe_with_ffprobe(input_path, st.st_size)
+
+        # A file that can no longer be read stays out of the cache (its old entry was popped above)
+        if info is not None:
+            self._probe_cache[cache_path] = (signature, info)
+            self._probe_cache_dirty = True
         return info
 
-    def _extract_video_info(self, input_path):
-        """Extract video information using ffprobe"""
+    def _load_probe_cache(self):
+        """Read the persistent probe cache (empty if it is missing, unreadable or disabled)"""
+        if self._probe_cache_path is None:
+            return {}
+        try:
+            raw = Path(self._probe_cache_path).read_bytes()
+            data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+            if data.get('version') != _PROBE_CACHE_VERSION:
+                return {}
+            return {path: ((mtime_ns, size), info) for path, (mtime_ns, size, info) in data['entries'].items()}
+        except (OSError, ValueError, TypeError, AttributeError, KeyError):
+            return {}
+
+    def _save_probe_cache(self):
+        """Write the probe cache back, keeping the most recently used entries"""
+        if not self._probe_cache_dirty:
+            return
+        recent = list(self._probe_cache.items())[-_PROBE_CACHE_LIMIT:]
+        data = {'version': _PROBE_CACHE_VERSION,
+                'entries': {path: [mtime_ns, size, info] for path, ((mtime_ns, size), info) in recent}}
+        path = Path(self._probe_cache_path)
+        temp_path = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # A temp file unique to this process, so runs exiting together never share one
+            with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name, suffix='.tmp', delete=False) as temp:
+                temp_path = temp.name
+                temp.write(orjson.dumps(data) if ORJSON_AVAILABLE else json.dumps(data).encode())
+            os.replace(temp_path, path)  # atomic, so a concurrent run never reads half a file
+        except OSError:
+            # Never leave a half-written temp file behind
+            if temp_path is not None:
+                with contextlib.suppress(OSError):
+                    os.unlink(temp_path)
+            return
+        self._probe_cache_dirty = False
+
+    def _probe_with_av(self, input_path, file_size):
+        """Probe with libavformat through PyAV, without starting a process
+
+        Only the container headers are read. PyAV doesn't expose a stream's display
+        matrix without decoding, so MP4/MOV files (the containers that carry one) are
+        left to ffprobe, which reports the rotation. Any PyAV failure does the same.
+        """
+        try:
+            with av.open(str(input_path)) as container:
+                if not container.streams.video or 'mov' in container.format.name.split(','):
+                    return None
+                stream = container.streams.video[0]
+
+                audio = container.streams.audio[0].codec_context if container.streams.audio else None
+
+                rate = stream.average_rate or stream.guessed_rate
+                return {
+                    'width': stream.width,
+                    'height': stream.height,
+                    'duration': container.duration / av.time_base if container.duration else 0.0,
+                    'bitrate': (container.bit_rate or 0) // 1000,
+                    'codec': stream.codec_context.name,
+                    'pix_fmt': stream.codec_context.pix_fmt,
+                    'fps': float(rate) if rate else 0.0,
+                    'has_audio': audio is not None,
+                    'audio_codec': audio.name if audio else None,
+                    'sample_rate': audio.sample_rate if audio else None,
+                    'channels': audio.channels if audio else None,
+                    'file_size': file_size,
+                    'format': {'format_name': container.format.name}
+                }
+        except Exception:
+            return None  # ffprobe takes over
+
+    def _probe_with_ffprobe(self, input_path, file_size):
+        """Probe with an ffprobe subprocess"""
         try:
             cmd = [
                 'ffprobe', '-v', 'quiet', '-print_format', 'json',
                 '-show_format', '-show_streams', str(input_path)
             ]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            result = subprocess.run(_spawn_cmd(cmd), capture_output=True, timeout=30, **_SPAWN_OPTIONS)
 
             if result.returncode == 0:
-                data = json.loads(result.stdout)
+                data = orjson.loads(result.stdout) if ORJSON_AVAILABLE else json.loads(result.stdout)
 
                 # Find video stream
                 video_stream = None
@@ -240,10 +569,19 @@ class VideoCompressor:
                 if video_stream:
                     width = int(video_stream.get('width', 0))
                     height = int(video_stream.get('height', 0))
+
+                    # FFmpeg auto-rotates on decode, so report the displayed orientation
+                    rotation = video_stream.get('tags', {}).get('rotate', 0)
+                    for side_data in video_stream.get('side_data_list', []):
+                        rotation = side_data.get('rotation', rotation)
+                    if int(float(rotation)) % 180:
+                        width, height = height, width
                     duration = float(data.get('format', {}).get('duration', 0))
                     bitrate = int(data.get('format', {}).get('bit_rate', 0)) // 1000
                     codec = video_stream.get('codec_name', 'unknown')
-                    fps = eval(video_stream.get('r_frame_rate', '0/1'))
+                    num, _, den = video_stream.get('r_frame_rate', '0/1').partition('/')
+                    den = int(den or 1)
+                    fps = int(num) / den if den else 0.0
 
                     return {
                         'width': width,
@@ -251,25 +589,44 @@ class VideoCompressor:
                         'duration': duration,
                         'bitrate': bitrate,
                         'codec': codec,
+                        'pix_fmt': video_stream.get('pix_fmt'),
                         'fps': fps,
                         'has_audio': audio_stream is not None,
+                        'audio_codec': audio_stream.get('codec_name') if audio_stream else None,
+                        'sample_rate': int(audio_stream.get('sample_rate', 0)) if audio_stream else None,
+                        'channels': audio_stream.get('channels') if audio_stream else None,
+                        'file_size': file_size,
                         'format': data.get('format', {})
                     }
 
-        except (subprocess.TimeoutExpired, json.JSONDecodeError, ValueError, ZeroDivisionError):
+        except (subprocess.TimeoutExpired, ValueError):
             pass
 
         return None
 
-    def _display_video_info(self, info, input_path):
-        """Display video info in a cool table format"""
+    def _probe_all(self, input_paths, stats=None):
+        """Probe several files concurrently so a batch starts with a warm probe cache
+
+        `stats` optionally holds each path's os.stat result, in the same order.
+        Returns one info dict (or None) per path, in order.
+        """
+        stats = stats or [None] * len(input_paths)
+
+        async def probe_all():
+            return await asyncio.gather(*(asyncio.to_thread(self._extract_video_info, path, st)
+                                          for path, st in zip(input_paths, stats)))
+
+        return asyncio.run(probe_all())
+
+    def _display_video_info(self, info, input_path, file_size):
+        """Display video info in a cool table format (file_size in bytes, already stat'ed)"""
         table = Table(title="📹 Video Information", show_header=True, header_style="bold magenta")
         table.add_column("Property", style="cyan", width=15)
         table.add_column("Value", style="green")
 
-        file_size = Path(input_path).stat().st_size / (1024 * 1024)
+        file_size = file_size / (1024 * 1024)
 
-        table.add_row("📁 Filename", Path(input_path).name)
+        table.add_row("📁 Filename", escape(Path(input_path).name))
         table.add_row("📏 Resolution", f"{info['width']}x{info['height']}")
         table.add_row("⏱️ Duration", f"{info['duration']:.1f}s ({info['duration']//60:.0f}m {info['duration']%60:.0f}s)")
         table.add_row("🎯 Codec", info['codec'].upper())
@@ -281,9 +638,9 @@ class VideoCompressor:
 
         self.console.print(table)
 
-    def _display_video_info_simple(self, info, input_path):
+    def _display_video_info_simple(self, info, input_path, file_size):
         """Simple video info display for when rich is not available"""
-        file_size = Path(input_path).stat().st_size / (1024 * 1024)
+        file_size = file_size / (1024 * 1024)
         print(f"\n📹 Video Information:")
         print(f"📁 Filename: {Path(input_path).name}")
         print(f"📏 Resolution: {info['width']}x{info['height']}")
@@ -291,19 +648,286 @@ class VideoCompressor:
         print(f"🎯 Codec: {info['codec'].upper()}")
         print(f"💾 File Size: {file_size:.1f} MB")
 
-    def calculate_scale_filter(self, width, height):
+    def calculate_scale_filter(self, width, height, encoder=None):
         """Calculate optimal scaling to fit Discord requirements"""
         max_width, max_height = 1280, 720
 
         if width <= max_width and height <= max_height:
             return None  # No scaling needed
 
-        # Calculate scale to fit within bounds while maintaining aspect ratio
-        scale_filter = f"scale='min({max_width},iw)':'min({max_height},ih)':force_original_aspect_ratio=decrease"
-        return scale_filter
+        # Work out the target size once per input size instead of per frame inside swscale
+        if (width, height) not in self._scale_cache:
+            self._scale_cache[(width, height)] = _fit_box(width, height, max_width, max_height)
+        target_width, target_height = self._scale_cache[(width, height)]
+
+        # Keep scaling on the same device as the decoded frames so they never leave GPU memory
+        if encoder and 'nvenc' in encoder and self._get_hwaccel_args(encoder):
+            return self._scale_filter_npp(target_width, target_height)
+        if encoder and 'nvenc' in encoder and {'hwupload_cuda', 'scale_cuda'} <= _ff_capabilities().filters:
+            # Software-decoded frames go up to the GPU once and are scaled there, next to NVENC
+            return self._scale_filter_upload_cuda(target_width, target_height)
+        if encoder and 'qsv' in encoder and self._get_hwaccel_args(encoder):
+            return self._scale_filter_qsv(target_width, target_height)
+        if encoder and 'vaapi' in encoder:
+            return self._scale_filter_vaapi(target_width, target_height)
+        return self._scale_filter_cpu(target_width, target_height)
+
+    def _scale_filter_cpu(self, width, height):
+        """Software scale to a precomputed size"""
+        return f"scale={width}:{height}"
+
+    def _scale_filter_npp(self, width, height):
+        """CUDA scale for NVDEC frames (scale_cuda on builds without libnpp)"""
+        filters = _ff_capabilities().filters
+        scaler = 'scale_cuda' if 'scale_npp' not in filters and 'scale_cuda' in filters else 'scale_npp'
+        return f"{scaler}=w={width}:h={height}:format=yuv420p"
+
+    def _scale_filter_upload_cuda(self, width, height):
+        """Upload software-decoded frames to CUDA, then scale them on the GPU"""
+        return f"format=yuv420p,hwupload_cuda,scale_cuda=w={width}:h={height}"
+
+    def _scale_filter_qsv(self, width, height):
+        """Quick Sync scale for frames decoded on the Intel GPU"""
+        return f"scale_qsv=w={width}:h={height}"
+
+    def _scale_filter_vaapi(self, width, height):
+        """VAAPI scale for surfaces already uploaded to the GPU"""
+        return f"scale_vaapi=w={width}:h={height}"
+
+    def _get_hwaccel_args(self, encoder):
+        """Return hardware decode arguments matching a GPU encoder (placed before -i)
+
+        Empty when this FFmpeg build lacks the matching hwaccel (per `ffmpeg -hwaccels`),
+        in which case decoding and scaling stay on the CPU.
+        """
+        hwaccels = _ff_capabilities().hwaccels
+        if 'nvenc' in encoder and 'cuda' in hwaccels:
+            return ['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda']
+        elif 'qsv' in encoder and 'qsv' in hwaccels:
+            return ['-hwaccel', 'qsv', '-hwaccel_output_format', 'qsv']
+        elif 'videotoolbox' in encoder and 'videotoolbox' in hwaccels:
+            return ['-hwaccel', 'videotoolbox']
+        elif 'vaapi' in encoder and 'vaapi' in hwaccels:
+            return ['-hwaccel', 'vaapi', '-vaapi_device', _VAAPI_DEVICE, '-hwaccel_output_format', 'vaapi']
+        return []
+
+    def _input_args(self, input_path, encoder, parallelism, concat=False):
+        """Global and input arguments, up to and including `-i input_path`
+
+        GPU encoders get hardware decode when this build has it. VAAPI always opens its
+        device, since the filter chain uploads software-decoded frames to it otherwise.
+        With `concat`, input_path is a concat demuxer list rather than a video.
+        """
+        hwaccel_args = self._get_hwaccel_args(encoder) if encoder else []
+        device_args = ['-vaapi_device', _VAAPI_DEVICE] if encoder and 'vaapi' in encoder and not hwaccel_args else []
+        input_args = ['-f', 'concat', '-safe', '0', '-i', str(input_path)] if concat else ['-i', str(input_path)]
+        return ['ffmpeg', '-y', '-hide_banner', '-loglevel', 'error', '-nostats', *hwaccel_args, *device_args,
+                *self._decoder_thread_args(hwaccel_args, parallelism), *input_args]
+
+    def _x264_thread_args(self, parallelism):
+        """libx264 threading: automatic for a lone encode, an even share of cores for parallel ones"""
+        if parallelism <= 1:
+            return ['-threads', '0']
+        threads = max(1, (os.cpu_count() or 1) // parallelism)
+        return ['-threads', str(threads), '-x264-params', f'threads={threads}:sliced-threads=0']
+
+    def _svtav1_thread_args(self, parallelism):
+        """SVT-AV1 threading: every core for a lone encode, an even share for parallel ones
+
+        SVT-AV1 sizes its thread pool from `lp` (logical processors) rather than -threads.
+        """
+        if parallelism <= 1:
+            return []
+        threads = max(1, (os.cpu_count() or 1) // parallelism)
+        return ['-svtav1-params', f'lp={threads}']
+
+    def _decoder_thread_args(self, hwaccel_args, parallelism):
+        """Input-side threading for software decodes: frame and slice threads over the same core share
+
+        Hardware decodes get nothing, since their decoder runs on the GPU.
+        """
+        if hwaccel_args:
+            return []
+        threads = '0' if parallelism <= 1 else str(max(1, (os.cpu_count() or 1) // parallelism))
+        return ['-threads', threads, '-thread_type', 'frame+slice']
+
+    def _movflags(self, settings, video_info):
+        """MP4 muxer flags: faststart for Discord-sized outputs, fragmented MP4 for large ones
+
+        faststart rewrites the finished file to move the moov atom up front; fragmented
+        MP4 needs no second pass, which only matters once outputs get big.
+        """
+        duration = video_info['duration'] if video_info else 0
+        max_kbps = int(settings['maxrate'].rstrip('k')) + 128  # video cap + AAC audio
+        if duration * max_kbps * 1000 / 8 > _FRAGMENTED_MP4_THRESHOLD:
+            return '+frag_keyframe+empty_moov+default_base_moof'
+        return '+faststart'
+
+    def _video_codec_args(self, quality, encoder=None, parallelism=1):
+        """Video encoder arguments for one output (the preset's CPU codec when no GPU encoder is given)"""
+        if not encoder:
+            if quality in _SVTAV1_ARGS and 'libsvtav1' in _ff_capabilities().encoders:
+                # SVT-AV1 is faster and smaller than x264 at the low-bitrate tiers
+                return [*_SVTAV1_ARGS[quality], *self._svtav1_thread_args(parallelism)]
+            tune_args = ['-tune', self.tune] if self.tune else []
+            return [*_QUALITY_ARGS[quality], *tune_args, *self._x264_thread_args(parallelism)]
+
+        settings = _QUALITY_SETTINGS[quality]
+        args = ['-c:v', encoder]
+        # GPU encoders use different quality settings
+        if 'nvenc' in encoder:
+            # Faster p-presets with VBR + constant-quality target and adaptive quantization
+            args.extend([
+                '-preset', settings['nvenc_preset'],
+                '-tune', settings['nvenc_tune'],
+                '-rc', 'vbr',
+                '-cq', settings['crf'],
+                '-spatial_aq', '1',
+                '-temporal_aq', '1',
+                '-b:v', settings['maxrate']
+            ])
+            # Only pass pipeline options this FFmpeg's NVENC wrapper knows about
+            supported_options = _encoder_options(encoder)
+            options = _NVENC_PIPELINE_OPTIONS
+            if settings['nvenc_tune'] == 'hq':
+                args.extend(['-bf', '3'])
+                options += _NVENC_HQ_OPTIONS
+            for option, value in options:
+                if option in supported_options:
+                    args.extend([f'-{option}', value])
+        elif 'qsv' in encoder:
+            # Quick Sync presets share x264's names; ICQ quality takes the CRF value
+            args.extend(['-preset', settings['preset'], '-global_quality', settings['crf']])
+        elif 'vaapi' in encoder:
+            args.extend(['-qp', settings['crf']])
+        elif 'videotoolbox' in encoder:
+            args.extend(['-q:v', str(int(int(settings['crf']) * 0.8))])
+
+        args.extend(['-maxrate', settings['maxrate'], '-bufsize', settings['bufsize']])
+        return args
+
+    def _video_filters(self, video_info, encoder=None):
+        """Video filter chain shared by every output; VAAPI needs its surfaces uploaded first"""
+        filters = []
+        if encoder and 'vaapi' in encoder:
+            filters.append('format=nv12|vaapi,hwupload')
+
+        # Add scaling if needed
+        if video_info:
+            scale_filter = self.calculate_scale_filter(video_info['width'], video_info['height'], encoder)
+            if scale_filter:
+                filters.append(scale_filter)
+        return filters
+
+    def _audio_and_mux_args(self, settings, video_info, output_path):
+        """AAC audio and MP4 muxer arguments, ending with the output path"""
+        return [
+            '-c:a', 'aac',
+            '-b:a', '128k',
+            '-movflags', self._movflags(settings, video_info),
+            str(output_path)
+        ]
+
+    def _build_ffmpeg_cmd(self, input_path, output_path, quality, video_info, encoder=None, parallelism=1):
+        """Build the FFmpeg command for one encode (the preset's CPU codec when no GPU encoder is given)
+
+        `parallelism` is how many encodes run side by side, used to split CPU threads.
+        """
+        cmd = self._input_args(input_path, encoder, parallelism)
+        cmd.extend(self._video_codec_args(quality, encoder, parallelism))
+
+        # One -vf chain per encode
+        filters = self._video_filters(video_info, encoder)
+        if filters:
+            cmd.extend(['-vf', ','.join(filters)])
 
-    def compress_video(self, input_path, output_path, quality="medium", use_gpu=False):
-        """Compress video with cool progress tracking and Discord optimization"""
+        cmd.extend(self._audio_and_mux_args(_QUALITY_SETTINGS[quality], video_info, output_path))
+        return cmd
+
+    def _build_fused_cmd(self, input_path, outputs, video_info, encoder=None):
+        """Build one FFmpeg command that writes every (output_path, quality) pair in `outputs`
+
+        The input is demuxed, decoded and scaled once, then split in memory to one encoder
+        per output, instead of decoding the same file again for each quality.
+        """
+        cmd = self._input_args(input_path, encoder, 1)
+
+        # Every quality shares the same target resolution, so scale before the split
+        branches = [f'[v{index}]' for index in range(len(outputs))]
+        graph = ','.join(self._video_filters(video_info, encoder) + [f'split={len(outputs)}'])
+        cmd.extend(['-filter_complex', f"[0:v:0]{graph}{''.join(branches)}"])
+
+        for branch, (output_path, quality) in zip(branches, outputs):
+            cmd.extend(['-map', branch, '-map', '0:a:0?'])
+            cmd.extend(self._video_codec_args(quality, encoder, len(outputs)))
+            cmd.extend(self._audio_and_mux_args(_QUALITY_SETTINGS[quality], video_info, output_path))
+        return cmd
+
+    def _can_remux(self, video_info, settings):
+        """Whether re-encoding to `settings` would gain nothing over copying the streams
+
+        True when the source is H.264 with AAC/MP3 audio (or none), so it plays on
+        Discord as-is, already fits the resolution cap, and its total bitrate is at or
+        near the preset's video cap plus audio.
+        """
+        if not video_info or not video_info['bitrate']:
+            return False
+        if video_info['codec'] != 'h264' or video_info.get('audio_codec') not in (None, 'aac', 'mp3'):
+            return False
+        if self.calculate_scale_filter(video_info['width'], video_info['height']):
+            return False
+        target_kbps = int(settings['maxrate'].rstrip('k')) + 128  # video cap + AAC audio
+        return video_info['bitrate'] <= target_kbps * _COPY_BITRATE_TOLERANCE
+
+    def _build_remux_cmd(self, input_path, output_path):
+        """Build an FFmpeg command that copies the streams into a new container, with no re-encode"""
+        cmd = ['ffmpeg', '-y', '-hide_banner', '-loglevel', 'error', '-nostats', '-i', str(input_path),
+               '-c', 'copy']
+        if Path(output_path).suffix.lower() in ('.mp4', '.m4v', '.mov'):
+            cmd.extend(['-movflags', '+faststart'])
+        cmd.append(str(output_path))
+        return cmd
+
+    def _build_concat_cmd(self, list_path, segment_pattern, quality, video_info, encoder, cut_times):
+        """Build one FFmpeg command that encodes a concat list and cuts it back apart at `cut_times`
+
+        Keyframes are forced at every cut so each segment starts exactly where its clip did.
+        Encoder delay can land a forced keyframe just after its cut time, so the muxer is
+        given half a frame of slack (as the segment muxer docs advise) to still split there.
+        """
+        cmd = self._input_args(list_path, encoder, 1, concat=True)
+        cmd.extend(self._video_codec_args(quality, encoder))
+
+        filters = self._video_filters(video_info, encoder)
+        if filters:
+            cmd.extend(['-vf', ','.join(filters)])
+
+        fps = video_info['fps'] or 30.0
+        cmd.extend(['-force_key_frames', cut_times, '-c:a', 'aac', '-b:a', '128k',
+                    '-f', 'segment', '-segment_times', cut_times, '-segment_time_delta', f'{1 / (2 * fps):.4f}',
+                    '-reset_timestamps', '1'])
+        if Path(segment_pattern).suffix.lower() in ('.mp4', '.m4v', '.mov'):
+            movflags = self._movflags(_QUALITY_SETTINGS[quality], video_info)
+            cmd.extend(['-segment_format_options', f'movflags={movflags}'])
+        cmd.append(str(segment_pattern))
+        return cmd
+
+    def compress_video(self, input_path, output_path, quality="medium", use_gpu=False, progress=None, parallelism=1,
+                       video_info=None, allow_copy=False):
+        """Compress video with cool progress tracking and Discord optimization
+
+        When a shared rich Progress is passed in, the encode is added to it as a task
+        instead of opening its own live display (used for parallel encodes).
+        `parallelism` tells the CPU encoder how many encodes are sharing the machine.
+        Pass `video_info` from an earlier probe to skip probing the input again.
+        With `allow_copy`, a source already under the target is remuxed instead of re-encoded.
+        """
+        return asyncio.run(self.compress_video_async(input_path, output_path, quality, use_gpu, progress,
+                                                     parallelism, video_info, allow_copy))
+
+    async def compress_video_async(self, input_path, output_path, quality="medium", use_gpu=False, progress=None,
+                                   parallelism=1, video_info=None, allow_copy=False):
+        """Coroutine behind compress_video, so several encodes can share one event loop"""
         import time
         start_time = time.time()
 
@@ -313,123 +937,71 @@ class VideoCompressor:
         if not input_path.exists():
             raise FileNotFoundError(f"Input file not found: {input_path}")
 
-        # Get video info with cool display
-        video_info = self.get_video_info(input_path)
+        # Other encodes are running alongside: their status all goes through the progress
+        # bars (or labelled progress lines without rich) and the batch summary, so skip the
+        # per-file panels and tables
+        shared = progress is not None or parallelism > 1
 
-        # Enhanced quality presets with emoji descriptions
-        quality_settings = {
-            "insane": {"crf": "18", "preset": "veryslow", "maxrate": "1200k", "bufsize": "2400k", "emoji": "🔥", "desc": "Maximum Quality"},
-            "high": {"crf": "23", "preset": "slow", "maxrate": "800k", "bufsize": "1600k", "emoji": "✨", "desc": "High Quality"},
-            "medium": {"crf": "28", "preset": "fast", "maxrate": "500k", "bufsize": "1000k", "emoji": "⚡", "desc": "Balanced"},
-            "low": {"crf": "32", "preset": "fast", "maxrate": "300k", "bufsize": "600k", "emoji": "🚀", "desc": "Speed Focus"},
-            "potato": {"crf": "35", "preset": "veryfast", "maxrate": "200k", "bufsize": "400k", "emoji": "🥔", "desc": "Tiny Size"}
-        }
+        # Get video info with cool display
+        if video_info is None:
+            video_info = self._extract_video_info(input_path) if shared else self.get_video_info(input_path)
 
-        settings = quality_settings.get(quality, quality_settings["medium"])
+        if quality not in _QUALITY_SETTINGS:
+            quality = "medium"
+        settings = _QUALITY_SETTINGS[quality]
 
         # Display compression settings
-        if RICH_AVAILABLE:
+        if RICH_AVAILABLE and not shared:
             panel = Panel(f"{settings['emoji']} {settings['desc']} (CRF {settings['crf']}, {settings['maxrate']} max bitrate)",
                          title="🎯 Compression Settings", border_style="cyan")
             self.console.print(panel)
-        else:
+        elif not shared:
             print(f"\n🎯 Using {quality} quality: {settings['desc']} (CRF {settings['crf']})")
 
-        # Build FFmpeg command with GPU support
-        cmd = ['ffmpeg', '-i', str(input_path)]
-
+        # Try to detect and use appropriate GPU encoder
+        gpu_encoder = None
         if use_gpu:
-            # Try to detect and use appropriate GPU encoder
             gpu_encoder = self._get_gpu_encoder()
             if gpu_encoder:
-                cmd.extend(['-c:v', gpu_encoder])
-                # GPU encoders use different quality settings
-                if 'nvenc' in gpu_encoder:
-                    cmd.extend(['-preset', 'p4', '-cq', settings['crf']])
-                elif 'vaapi' in gpu_encoder:
-                    cmd.extend(['-qp', settings['crf']])
-                elif 'videotoolbox' in gpu_encoder:
-                    cmd.extend(['-q:v', str(int(int(settings['crf']) * 0.8))])
-
-                cmd.extend(['-maxrate', settings['maxrate'], '-bufsize', settings['bufsize']])
-
-                if RICH_AVAILABLE:
-                    self.console.print(f"🚀 Using GPU encoder: {gpu_encoder}", style="green")
-                else:
-                    print(f"🚀 Using GPU encoder: {gpu_encoder}")
+                if not shared:
+                    self._print(f"🚀 Using GPU encoder: {gpu_encoder}", style="green")
             else:
-                if RICH_AVAILABLE:
-                    self.console.print("⚠️ GPU encoding requested but no supported GPU encoder found, falling back to CPU", style="yellow")
-                else:
-                    print("⚠️ GPU encoding requested but no supported GPU encoder found, falling back to CPU")
+                self._print("⚠️ GPU encoding requested but no supported GPU encoder found, falling back to CPU", style="yellow")
                 use_gpu = False
 
-        if not use_gpu:
-            # Fallback to CPU encoding
-            cmd.extend([
-                '-c:v', 'libx264',
-                '-preset', settings['preset'],
-                '-crf', settings['crf'],
-                '-maxrate', settings['maxrate'],
-                '-bufsize', settings['bufsize']
-            ])
+        if not shared and video_info and self.calculate_scale_filter(video_info['width'], video_info['height']):
+            self._print(f"📏 Scaling video to fit {self.max_resolution}", style="yellow")
 
-        # Add scaling if needed
-        if video_info:
-            scale_filter = self.calculate_scale_filter(video_info['width'], video_info['height'])
-            if scale_filter:
-                cmd.extend(['-vf', scale_filter])
-                if RICH_AVAILABLE:
-                    self.console.print(f"📏 Scaling video to fit {self.max_resolution}", style="yellow")
-                else:
-                    print(f"📏 Scaling video to fit {self.max_resolution}")
-
-        # Audio settings
-        cmd.extend([
-            '-c:a', 'aac',
-            '-b:a', '128k',
-            '-movflags', '+faststart',
-            '-y',
-            str(output_path)
-        ])
+        # Build FFmpeg command (hardware decode + on-GPU filtering when a GPU encoder is used)
+        cmd = self._build_ffmpeg_cmd(input_path, output_path, quality, video_info, gpu_encoder, parallelism)
 
         try:
-            result = self._run_compression_with_progress(cmd, input_path, output_path, video_info)
+            # Re-encoding a source that is already small enough only costs time and quality
+            if allow_copy and self._can_remux(video_info, settings):
+                if not shared:
+                    self._print(f"📦 Source is already under the {quality} target ({video_info['bitrate']}k), "
+                                f"copying streams instead of re-encoding", style="cyan")
+                remux_cmd = self._build_remux_cmd(input_path, output_path)
+                if await self._run_compression_with_progress(remux_cmd, input_path, output_path, video_info, progress,
+                                                             shared):
+                    if not shared:
+                        self._display_timing_info(time.time() - start_time, input_path, False)
+                    return True
+                self._print("⚠️ Stream copy failed, re-encoding instead", style="yellow")
+
+            result = await self._run_compression_with_progress(cmd, input_path, output_path, video_info, progress,
+                                                               shared)
 
             # If GPU encoding failed and we were using GPU, try CPU fallback
             if not result and use_gpu:
-                if RICH_AVAILABLE:
-                    self.console.print("⚠️ GPU encoding failed, attempting CPU fallback...", style="yellow")
-                else:
-                    print("⚠️ GPU encoding failed, attempting CPU fallback...")
-
-                # Rebuild command with CPU encoding
-                cpu_cmd = ['ffmpeg', '-i', str(input_path)]
-                cpu_cmd.extend([
-                    '-c:v', 'libx264',
-                    '-preset', settings['preset'],
-                    '-crf', settings['crf'],
-                    '-maxrate', settings['maxrate'],
-                    '-bufsize', settings['bufsize']
-                ])
-
-                # Add scaling if needed
-                if video_info:
-                    scale_filter = self.calculate_scale_filter(video_info['width'], video_info['height'])
-                    if scale_filter:
-                        cpu_cmd.extend(['-vf', scale_filter])
-
-                # Audio settings
-                cpu_cmd.extend([
-                    '-c:a', 'aac',
-                    '-b:a', '128k',
-                    '-movflags', '+faststart',
-                    '-y',
-                    str(output_path)
-                ])
+                self._print("⚠️ GPU encoding failed, attempting CPU fallback...", style="yellow")
+
+                # Rebuild command with CPU decoding, filtering and encoding
+                cpu_cmd = self._build_ffmpeg_cmd(input_path, output_path, quality, video_info, parallelism=parallelism)
 
                 # Try CPU encoding
-                result = self._run_compression_with_progress(cpu_cmd, input_path, output_path, video_info)
+                result = await self._run_compression_with_progress(cpu_cmd, input_path, output_path, video_info,
+                                                                   progress, shared)
                 use_gpu = False  # Update flag for timing display
 
             # Calculate elapsed time
@@ -437,30 +1009,30 @@ class VideoCompressor:
             elapsed_time = end_time - start_time
 
             # If successful, show timing and return result
-            if result:
+            if result and not shared:
                 self._display_timing_info(elapsed_time, input_path, use_gpu)
 
             return result
         except subprocess.TimeoutExpired:
-            if RICH_AVAILABLE:
-                self.console.print("⏰ Error: Compression timed out (30 minutes)", style="bold red")
-            else:
-                print("⏰ Error: Compression timed out (30 minutes)")
+            self._fail("⏰ Error: Compression timed out (30 minutes)", style="bold red")
             return False
 
+    @staticmethod
+    def _fmt_hms(seconds):
+        """Format a duration as '1m 5.0s', or '5.0s' when under a minute"""
+        minutes, seconds = divmod(seconds, 60)
+        return f"{int(minutes)}m {seconds:.1f}s" if minutes else f"{seconds:.1f}s"
+
     def _display_timing_info(self, elapsed_time, input_path, use_gpu):
         """Display compression timing information"""
-        minutes = int(elapsed_time // 60)
-        seconds = elapsed_time % 60
-
         encoding_type = "GPU" if use_gpu else "CPU"
-        time_str = f"{minutes}m {seconds:.1f}s" if minutes > 0 else f"{seconds:.1f}s"
+        time_str = self._fmt_hms(elapsed_time)
 
         if RICH_AVAILABLE:
             timing_panel = Panel(
                 f"⏱️ Compression time: {time_str}\n"
                 f"🖥️ Encoding: {encoding_type}\n"
-                f"📁 File: {input_path.name}",
+                f"📁 File: {escape(input_path.name)}",
                 title="⚡ Performance",
                 border_style="green"
             )
@@ -471,146 +1043,160 @@ class VideoCompressor:
             print(f"🖥️ Encoding: {encoding_type}")
             print(f"📁 File: {input_path.name}")
 
-    def _run_compression_with_progress(self, cmd, input_path, output_path, video_info):
-        """Run compression with real-time progress tracking"""
+    async def _run_compression_with_progress(self, cmd, input_path, output_path, video_info, progress=None,
+                                             shared=False):
+        """Run compression with real-time progress tracking
+
+        `shared` encodes run alongside others, so they skip the per-file results table and
+        leave the size report to the caller's summary.
+        """
         duration = video_info['duration'] if video_info else 0
 
+        # Encodes of the same input can share one display, so label shared tasks by output
+        label = output_path.name if shared else input_path.name
+        if not await self._run_ffmpeg_async(cmd, duration, label, progress):
+            return False
+        if not shared:
+            return self.analyze_result(input_path, output_path)
+
+        # The finished bar is the status, so only check the output exists
+        if not os.path.exists(output_path):
+            self._fail(f"❌ Error: {output_path.name} was not created", style="bold red")
+            return False
+        return True
+
+    def _run_ffmpeg(self, cmd, duration, label, progress=None):
+        """Run an FFmpeg command with a rich progress bar when possible; returns whether it succeeded"""
+        return asyncio.run(self._run_ffmpeg_async(cmd, duration, label, progress))
+
+    async def _run_ffmpeg_async(self, cmd, duration, label, progress=None):
+        """Coroutine behind _run_ffmpeg"""
         if RICH_AVAILABLE and duration > 0:
-            return self._run_with_rich_progress(cmd, input_path, output_path, duration)
+            return await self._run_with_rich_progress(cmd, duration, label, progress)
         else:
-            return self._run_simple_compression(cmd, input_path, output_path)
+            return await self._run_simple_compression(cmd, label, duration)
 
-    def _run_with_rich_progress(self, cmd, input_path, output_path, duration):
-        """Run compression with rich progress bar"""
-        # Add progress reporting to FFmpeg command
-        progress_cmd = cmd + ['-progress', 'pipe:2']  # Send progress to stderr
-
-        with Progress(
+    def _create_progress(self):
+        """Create the rich progress display used for encodes"""
+        return Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             BarColumn(),
             TaskProgressColumn(),
             TimeRemainingColumn(),
-            console=self.console
-        ) as progress:
+            console=self.console,
+            refresh_per_second=10  # redraw rate is fixed, however many encodes report in
+        )
 
-            task = progress.add_task(f"🎬 Compressing {input_path.name}...", total=duration)
+    def _shared_progress(self):
+        """Progress display shared by parallel encodes (a no-op context without rich)
 
-            process = subprocess.Popen(progress_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                                     universal_newlines=True, bufsize=1)
+        Every encode is a coroutine on the same event loop, so they all update it directly.
+        """
+        if not RICH_AVAILABLE:
+            return contextlib.nullcontext()
+        return self._create_progress()
 
-            current_time = 0
-            error_output = []
+    async def _run_with_rich_progress(self, cmd, duration, label, progress=None):
+        """Run compression with rich progress bar (adds a task to `progress` if one is shared)"""
+        if progress is None:
+            with self._create_progress() as progress:
+                return await self._run_with_rich_progress(cmd, duration, label, progress)
 
-            # Read both stdout and stderr
-            import select
-            import sys
+        label = escape(label)  # task descriptions are rendered as markup
+        task = progress.add_task(f"🎬 Compressing {label}...", total=duration)
 
-            # For Windows compatibility, use a simpler approach
-            if sys.platform == 'win32':
-                return self._run_windows_progress(process, task, progress, duration, input_path, output_path)
+        def on_progress(position, speed):
+            description = f"🎬 Compressing {label} ({speed})..." if speed else f"🎬 Compressing {label}..."
+            progress.update(task, completed=min(position, duration), description=description)
 
-            # Unix-like systems can use select
-            while True:
-                if process.poll() is not None:
-                    break
+        returncode, error_output = await self._encode_async(cmd, on_progress)
 
-                # Read stderr for progress info
-                stderr_line = process.stderr.readline()
-                if stderr_line:
-                    error_output.append(stderr_line)
-                    # Parse FFmpeg progress from stderr
-                    if 'out_time_us=' in stderr_line:
-                        time_match = re.search(r'out_time_us=(\d+)', stderr_line)
-                        if time_match:
-                            current_time = int(time_match.group(1)) / 1000000  # Convert microseconds to seconds
-                            progress.update(task, completed=min(current_time, duration))
-                    elif 'out_time=' in stderr_line:
-                        time_match = re.search(r'out_time=(\d+\.\d+)', stderr_line)
-                        if time_match:
-                            current_time = float(time_match.group(1))
-                            progress.update(task, completed=min(current_time, duration))
-
-            process.wait()
-
-            if process.returncode == 0:
-                progress.update(task, completed=duration, description=f"✅ {input_path.name} compressed!")
-                time.sleep(0.5)  # Show completion briefly
-                return self.analyze_result(input_path, output_path)
-            else:
-                full_error = ''.join(error_output)
-                self.console.print(f"❌ FFmpeg error: {full_error[-500:]}", style="bold red")  # Show last 500 chars
-                return False
+        if returncode == 0:
+            progress.update(task, completed=duration, description=f"✅ {label} compressed!")
+            progress.refresh()  # Render the completed state before analysis output
+            return True
+        else:
+            full_error = error_output.decode(errors='replace')
+            self._fail(f"❌ FFmpeg error: {full_error[-500:]}", style="bold red")  # Show last 500 chars
+            return False
 
-    def _run_windows_progress(self, process, task, progress, duration, input_path, output_path):
-        """Windows-specific progress handling"""
-        import threading
-        import queue
+    async def _encode_async(self, cmd, on_progress):
+        """Run FFmpeg on non-blocking pipes, passing its -progress output to on_progress(seconds, speed)
 
-        error_output = []
-        current_time = 0
+        Works the same on Windows (proactor loop) and Unix, with no reader thread.
+        stdout is read in bulk and scanned once per chunk, while stderr drains alongside
+        into a bounded tail, so memory stays flat however long the encode runs.
+        Returns (returncode, stderr_tail_bytes).
+        """
+        # Machine-readable key=value progress on stdout; stderr then only carries errors
+        process = await asyncio.create_subprocess_exec(
+            *_spawn_cmd(cmd), '-progress', 'pipe:1',
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, limit=_PIPE_BUFSIZE, **_SPAWN_OPTIONS
+        )
+        stderr_task = asyncio.ensure_future(_drain_tail(process.stderr))
 
-        def read_stderr():
+        pending = bytearray()  # partial last line carried over to the next read
+        try:
             while True:
-                line = process.stderr.readline()
-                if not line:
+                chunk = await process.stdout.read(_PIPE_READ_SIZE)
+                if not chunk:
                     break
-                error_output.append(line)
-
-                # Parse progress
-                if 'out_time_us=' in line:
-                    time_match = re.search(r'out_time_us=(\d+)', line)
-                    if time_match:
-                        nonlocal current_time
-                        current_time = int(time_match.group(1)) / 1000000
-                        progress.update(task, completed=min(current_time, duration))
-                elif 'out_time=' in line:
-                    time_match = re.search(r'out_time=(\d+\.\d+)', line)
-                    if time_match:
-                        current_time = float(time_match.group(1))
-                        progress.update(task, completed=min(current_time, duration))
-
-        # Start stderr reading thread
-        stderr_thread = threading.Thread(target=read_stderr, daemon=True)
-        stderr_thread.start()
-
-        # Wait for process to complete
-        process.wait()
-        stderr_thread.join(timeout=1.0)  # Give thread a moment to finish
-
-        if process.returncode == 0:
-            progress.update(task, completed=duration, description=f"✅ {input_path.name} compressed!")
-            time.sleep(0.5)
-            return self.analyze_result(input_path, output_path)
-        else:
-            full_error = ''.join(error_output)
-            self.console.print(f"❌ FFmpeg error: {full_error[-500:]}", style="bold red")
-            return False
-
-    def _run_simple_compression(self, cmd, input_path, output_path):
-        """Simple compression without rich progress"""
-        print(f"🎬 Compressing: {input_path.name} -> {output_path.name}")
+                pending += chunk
+
+                cut = pending.rfind(b'\n') + 1
+                if not cut:
+                    continue
+                block = pending[:cut]
+                del pending[:cut]
+                current_time = _last_progress_time(block)
+                if current_time is not None:
+                    on_progress(current_time, _last_progress_speed(block))
+
+            stderr_tail = await stderr_task
+            return await process.wait(), stderr_tail
+        except asyncio.CancelledError:
+            # Timed out or abandoned: don't leave ffmpeg running behind us
+            process.kill()
+            await process.wait()
+            raise
+
+    async def _run_simple_compression(self, cmd, label, duration=0):
+        """Simple compression without rich progress: a line per 10% when the duration is known"""
+        print(f"🎬 Compressing: {label}")
         print("⏳ This may take a while...")
 
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=1800)
+        reported = 0
 
-        if result.returncode == 0:
-            return self.analyze_result(input_path, output_path)
+        def on_progress(position, speed):
+            nonlocal reported
+            if duration <= 0:
+                return
+            percent = min(100, int(position * 100 / duration)) // 10 * 10
+            if percent > reported:
+                reported = percent
+                print(f"⏳ {label}: {percent}%" + (f" ({speed})" if speed else ""))
+
+        try:
+            returncode, stderr = await asyncio.wait_for(self._encode_async(cmd, on_progress), timeout=1800)
+        except asyncio.TimeoutError:
+            raise subprocess.TimeoutExpired(cmd, 1800)
+
+        if returncode == 0:
+            return True
         else:
-            print(f"❌ FFmpeg error: {result.stderr}")
+            sys.stderr.write(f"❌ FFmpeg error: {stderr.decode(errors='replace')}\n")
             return False
 
     def analyze_result(self, input_path, output_path):
         """Analyze compression results with cool visual feedback"""
-        if not output_path.exists():
-            if RICH_AVAILABLE:
-                self.console.print("❌ Error: Output file was not created", style="bold red")
-            else:
-                print("❌ Error: Output file was not created")
+        try:
+            output_size = os.stat(output_path).st_size
+        except FileNotFoundError:
+            self._fail("❌ Error: Output file was not created", style="bold red")
             return False
 
-        input_size = input_path.stat().st_size
-        output_size = output_path.stat().st_size
+        input_size = os.stat(input_path).st_size
 
         input_mb = input_size / (1024 * 1024)
         output_mb = output_size / (1024 * 1024)
@@ -657,67 +1243,163 @@ class VideoCompressor:
 
         return True
 
+    async def _run_job(self, job, progress=None, parallelism=1, video_info=None, allow_copy=False):
+        """Run one (input_path, output_path, quality, use_gpu) job; returns (success, elapsed_seconds, error)"""
+        start_time = time.time()
+        try:
+            success = await self.compress_video_async(*job, progress=progress, parallelism=parallelism,
+                                                      video_info=video_info, allow_copy=allow_copy)
+            return success, time.time() - start_time, None
+        except Exception as e:
+            return False, time.time() - start_time, str(e)
+
+    def _run_jobs(self, jobs, max_parallel=1, video_info=None, allow_copy=False):
+        """Run (input_path, output_path, quality, use_gpu) jobs, up to max_parallel at a time
+
+        `video_info` is a shared probe result for jobs that all encode the same input;
+        `allow_copy` is passed on to every encode.
+        Returns one (success, elapsed_seconds, error) tuple per job, in job order.
+        """
+        parallelism = max(1, min(max_parallel, len(jobs)))
+        if any(use_gpu for _, _, _, use_gpu in jobs):
+            self._get_gpu_encoder()  # detect up front rather than inside the event loop
+
+        # Every encode is its own ffmpeg process, so one event loop can keep several in
+        # flight; a semaphore caps how many run at once
+        async def run_all(progress, job_parallelism):
+            semaphore = asyncio.Semaphore(parallelism)
+
+            async def run_one(job):
+                async with semaphore:
+                    return await self._run_job(job, progress, job_parallelism, video_info, allow_copy)
+
+            return await asyncio.gather(*(run_one(job) for job in jobs))
+
+        if parallelism == 1:
+            return asyncio.run(run_all(None, 1))
+        with self._shared_progress() as progress:
+            return asyncio.run(run_all(progress, parallelism))
+
+    def _run_lanes(self, lanes, video_info=None):
+        """Run several job lists side by side, each one strictly in order
+
+        Used to keep one encode per device busy (e.g. a CPU lane and a GPU lane), so
+        each device's timings stay uncontended. Returns one result list per lane.
+        """
+        lanes = [lane for lane in lanes if lane]
+        if len(lanes) <= 1:
+            return [self._run_jobs(lane, 1, video_info) for lane in lanes]
+
+        async def run_lanes(progress):
+            async def run_lane(lane):
+                return [await self._run_job(job, progress, video_info=video_info) for job in lane]
+
+            return await asyncio.gather(*(run_lane(lane) for lane in lanes))
+
+        with self._shared_progress() as progress:
+            return asyncio.run(run_lanes(progress))
+
     def compress_video_multiple_qualities(self, input_path, qualities: List[str], use_gpu=False):
-        """Compress a single video with multiple quality settings"""
+        """Compress a single video with multiple quality settings in one FFmpeg run
+
+        The input is decoded once and split to one encoder per quality.
+        """
+        import time
+        start_time = time.time()
+
         input_path = Path(input_path)
         if not input_path.exists():
             raise FileNotFoundError(f"Input file not found: {input_path}")
 
         successful = []
         failed = []
+        outputs = []
 
         for quality in qualities:
             # Validate quality
-            valid_qualities = ['insane', 'high', 'medium', 'low', 'potato']
-            if quality not in valid_qualities:
-                if RICH_AVAILABLE:
-                    self.console.print(f"⚠️ Invalid quality '{quality}', skipping...", style="yellow")
-                else:
-                    print(f"⚠️ Invalid quality '{quality}', skipping...")
+            if quality not in _QUALITY_SETTINGS:
+                self._print(f"⚠️ Invalid quality '{quality}', skipping...", style="yellow")
                 failed.append((quality, "Invalid quality setting"))
                 continue
 
             # Generate output filename with quality suffix, default to .mp4
             gpu_suffix = "_gpu" if use_gpu else ""
-            output_path = input_path.with_stem(f"{input_path.stem}_{quality}{gpu_suffix}").with_suffix('.mp4')
+            outputs.append((quality, input_path.parent / f"{input_path.stem}_{quality}{gpu_suffix}.mp4"))
+
+        if not outputs:
+            return successful, failed
+        if len(outputs) == 1:
+            quality, output_path = outputs[0]
+            if self.compress_video(input_path, output_path, quality, use_gpu):
+                successful.append(str(output_path))
+            else:
+                failed.append((quality, "Compression failed"))
+            return successful, failed
 
-            if RICH_AVAILABLE:
-                self.console.print(f"\n🎯 Processing with {quality} quality...", style="bold blue")
+        video_info = self.get_video_info(input_path)
+
+        if RICH_AVAILABLE:
+            lines = [f"{_QUALITY_SETTINGS[q]['emoji']} {q}: {_QUALITY_SETTINGS[q]['desc']} (CRF {_QUALITY_SETTINGS[q]['crf']})"
+                     for q, _ in outputs]
+            self.console.print(Panel("\n".join(lines), title="🎯 Compression Settings (single pass)", border_style="cyan"))
+        else:
+            print(f"\n🎯 Encoding {', '.join(q for q, _ in outputs)} in a single pass")
+
+        gpu_encoder = self._get_gpu_encoder() if use_gpu else None
+        if use_gpu and not gpu_encoder:
+            self._print("⚠️ GPU encoding requested but no supported GPU encoder found, falling back to CPU", style="yellow")
+            use_gpu = False
+        elif gpu_encoder:
+            self._print(f"🚀 Using GPU encoder: {gpu_encoder}", style="green")
+
+        if video_info and self.calculate_scale_filter(video_info['width'], video_info['height']):
+            self._print(f"📏 Scaling video to fit {self.max_resolution}", style="yellow")
+
+        duration = video_info['duration'] if video_info else 0
+        label = f"{input_path.name} ({', '.join(q for q, _ in outputs)})"
+        pairs = [(output_path, quality) for quality, output_path in outputs]
+
+        try:
+            cmd = self._build_fused_cmd(input_path, pairs, video_info, gpu_encoder)
+            ran = self._run_ffmpeg(cmd, duration, label)
+
+            # If GPU encoding failed, retry the whole pass on the CPU
+            if not ran and use_gpu:
+                self._print("⚠️ GPU encoding failed, attempting CPU fallback...", style="yellow")
+                ran = self._run_ffmpeg(self._build_fused_cmd(input_path, pairs, video_info), duration, label)
+                use_gpu = False
+        except subprocess.TimeoutExpired:
+            self._fail("⏰ Error: Compression timed out (30 minutes)", style="bold red")
+            ran = False
+
+        for quality, output_path in outputs:
+            if ran and self.analyze_result(input_path, output_path):
+                successful.append(str(output_path))
             else:
-                print(f"\n🎯 Processing with {quality} quality...")
+                failed.append((quality, "Compression failed"))
 
-            try:
-                success = self.compress_video(input_path, output_path, quality, use_gpu)
-                if success:
-                    successful.append(str(output_path))
-                else:
-                    failed.append((quality, "Compression failed"))
-            except Exception as e:
-                failed.append((quality, str(e)))
+        if successful:
+            self._display_timing_info(time.time() - start_time, input_path, use_gpu)
 
         return successful, failed
 
-    def run_benchmark(self, input_path):
-        """Run comprehensive benchmark tests on a video file"""
+    def run_benchmark(self, input_path, concurrent=True):
+        """Run comprehensive benchmark tests on a video file
+
+        CPU and GPU configurations each run one at a time, with the CPU and GPU
+        lanes running side by side (pass concurrent=False for fully sequential runs).
+        """
         input_path = Path(input_path)
         if not input_path.exists():
             raise FileNotFoundError(f"Input file not found: {input_path}")
 
-        import time
-
-        if RICH_AVAILABLE:
-            self.console.print("🏁 Starting benchmark tests...", style="bold cyan")
-            self.console.print("This will test various encoding configurations to find optimal settings.", style="cyan")
-        else:
-            print("🏁 Starting benchmark tests...")
-            print("This will test various encoding configurations to find optimal settings.")
+        self._print("🏁 Starting benchmark tests...", style="bold cyan")
+        self._print("This will test various encoding configurations to find optimal settings.", style="cyan")
 
         # Create benchmark directory
         benchmark_dir = Path("benchmark_results")
         benchmark_dir.mkdir(exist_ok=True)
 
-        benchmark_results = []
-
         # Test configurations: (quality, use_gpu, description)
         test_configs = [
             ("medium", False, "CPU Medium"),
@@ -729,27 +1411,56 @@ class VideoCompressor:
         ]
 
         total_tests = len(test_configs)
+        benchmark_results = [None] * total_tests
 
-        for i, (quality, use_gpu, description) in enumerate(test_configs, 1):
-            if RICH_AVAILABLE:
-                self.console.print(f"\n🧪 Test {i}/{total_tests}: {description}", style="bold blue")
-            else:
-                print(f"\n🧪 Test {i}/{total_tests}: {description}")
+        # Probe once; every configuration encodes the same input
+        video_info = self.get_video_info(input_path)
 
-            # Generate output filename
-            output_filename = f"benchmark_{quality}_{('gpu' if use_gpu else 'cpu')}.mp4"
-            output_path = benchmark_dir / output_filename
+        groups = []
+        lanes = []
+        for group_gpu in (False, True):
+            group = [(i, config) for i, config in enumerate(test_configs, 1) if config[1] == group_gpu]
+            jobs = []
 
-            try:
-                start_time = time.time()
-                success = self.compress_video(input_path, output_path, quality, use_gpu)
-                end_time = time.time()
+            for i, (quality, use_gpu, description) in group:
+                self._print(f"\n🧪 Test {i}/{total_tests}: {description}", style="bold blue")
+
+                # Generate output filename
+                output_filename = f"benchmark_{quality}_{('gpu' if use_gpu else 'cpu')}.mp4"
+                jobs.append((input_path, benchmark_dir / output_filename, quality, use_gpu))
 
-                if success and output_path.exists():
-                    elapsed_time = end_time - start_time
-                    output_size = output_path.stat().st_size / (1024 * 1024)  # MB
+            groups.append(group)
+            lanes.append(jobs)
 
-                    benchmark_results.append({
+        # One encode per device at a time; the CPU and GPU lanes are independent unless
+        # there is no GPU encoder and the "GPU" tests would fall back to the CPU too
+        if concurrent and self._get_gpu_encoder():
+            lane_outcomes = self._run_lanes(lanes, video_info)
+        else:
+            lane_outcomes = [self._run_jobs(jobs, 1, video_info) for jobs in lanes]
+
+        for group, jobs, outcomes in zip(groups, lanes, lane_outcomes):
+            for (i, (quality, use_gpu, description)), job, (success, elapsed_time, error) in zip(group, jobs, outcomes):
+                output_path = job[1]
+                try:
+                    output_bytes = os.stat(output_path).st_size if success else None
+                except FileNotFoundError:
+                    output_bytes = None
+
+                if error:
+                    benchmark_results[i - 1] = {
+                        'description': description,
+                        'quality': quality,
+                        'gpu': use_gpu,
+                        'success': False,
+                        'error': error
+                    }
+                    self._fail(f"❌ {description} error: {error}", style="red")
+
+                elif output_bytes is not None:
+                    output_size = output_bytes / (1024 * 1024)  # MB
+
+                    benchmark_results[i - 1] = {
                         'description': description,
                         'quality': quality,
                         'gpu': use_gpu,
@@ -757,39 +1468,18 @@ class VideoCompressor:
                         'size_mb': output_size,
                         'output_path': output_path,
                         'success': True
-                    })
+                    }
 
-                    if RICH_AVAILABLE:
-                        minutes = int(elapsed_time // 60)
-                        seconds = elapsed_time % 60
-                        time_str = f"{minutes}m {seconds:.1f}s" if minutes > 0 else f"{seconds:.1f}s"
-                        self.console.print(f"✅ Completed in {time_str} - {output_size:.1f}MB", style="green")
-                    else:
-                        print(f"✅ Completed in {elapsed_time:.1f}s - {output_size:.1f}MB")
+                    self._print(f"✅ {description} completed in {self._fmt_hms(elapsed_time)} - {output_size:.1f}MB",
+                                style="green")
                 else:
-                    benchmark_results.append({
+                    benchmark_results[i - 1] = {
                         'description': description,
                         'quality': quality,
                         'gpu': use_gpu,
                         'success': False
-                    })
-                    if RICH_AVAILABLE:
-                        self.console.print("❌ Failed", style="red")
-                    else:
-                        print("❌ Failed")
-
-            except Exception as e:
-                benchmark_results.append({
-                    'description': description,
-                    'quality': quality,
-                    'gpu': use_gpu,
-                    'success': False,
-                    'error': str(e)
-                })
-                if RICH_AVAILABLE:
-                    self.console.print(f"❌ Error: {e}", style="red")
-                else:
-                    print(f"❌ Error: {e}")
+                    }
+                    self._fail(f"❌ {description} failed", style="red")
 
         # Display benchmark results
         self._display_benchmark_results(benchmark_results, input_path)
@@ -801,15 +1491,12 @@ class VideoCompressor:
         successful_results = [r for r in results if r.get('success', False)]
 
         if not successful_results:
-            if RICH_AVAILABLE:
-                self.console.print("❌ No successful benchmark tests completed", style="bold red")
-            else:
-                print("❌ No successful benchmark tests completed")
+            self._fail("❌ No successful benchmark tests completed", style="bold red")
             return
 
         if RICH_AVAILABLE:
             # Create benchmark results table
-            table = Table(title=f"🏆 Benchmark Results for {input_path.name}", show_header=True, header_style="bold magenta")
+            table = Table(title=f"🏆 Benchmark Results for {escape(input_path.name)}", show_header=True, header_style="bold magenta")
             table.add_column("Configuration", style="cyan", width=15)
             table.add_column("Time", style="green", width=10)
             table.add_column("File Size", style="yellow", width=10)
@@ -827,8 +1514,7 @@ class VideoCompressor:
             for result in successful_results:
                 # Format time
                 time = result['time']
-                minutes = int(time // 60)
-                time_str = f"{minutes}m {time % 60:.1f}s" if minutes > 0 else f"{time:.1f}s"
+                time_str = self._fmt_hms(time)
 
                 # Calculate speed comparison
                 if cpu_medium_time and cpu_medium_time > 0:
@@ -869,25 +1555,40 @@ class VideoCompressor:
             # Simple analysis
             self._display_benchmark_analysis_simple(successful_results)
 
+    def _summarize(self, results):
+        """Find the fastest GPU run, fastest CPU run and best quality/time ratio in one pass"""
+        fastest_gpu = fastest_cpu = best_ratio_config = None
+        best_ratio = 0
+
+        for result in results:
+            time = result['time']
+            if result['gpu']:
+                if fastest_gpu is None or time < fastest_gpu['time']:
+                    fastest_gpu = result
+            elif fastest_cpu is None or time < fastest_cpu['time']:
+                fastest_cpu = result
+
+            ratio = _QSCORE.get(result['quality'], 2) / time  # Higher is better
+            if ratio > best_ratio:
+                best_ratio = ratio
+                best_ratio_config = result
+
+        return fastest_gpu, fastest_cpu, best_ratio_config
+
     def _display_benchmark_analysis(self, results):
         """Display detailed benchmark analysis with Rich formatting"""
-        # Find best GPU and CPU results
-        gpu_results = [r for r in results if r['gpu']]
-        cpu_results = [r for r in results if not r['gpu']]
-
-        if gpu_results and cpu_results:
-            # Find fastest GPU and CPU
-            fastest_gpu = min(gpu_results, key=lambda x: x['time'])
-            fastest_cpu = min(cpu_results, key=lambda x: x['time'])
+        fastest_gpu, fastest_cpu, best_ratio_config = self._summarize(results)
 
+        if fastest_gpu and fastest_cpu:
             gpu_speedup = fastest_cpu['time'] / fastest_gpu['time']
+            best_ratio_str = best_ratio_config['description'] if best_ratio_config else "Unknown"
 
             analysis_text = f"""
 💡 Analysis:
 • Fastest GPU: {fastest_gpu['description']} ({fastest_gpu['time']:.1f}s)
 • Fastest CPU: {fastest_cpu['description']} ({fastest_cpu['time']:.1f}s)
 • GPU Speedup: {gpu_speedup:.1f}x faster than CPU
-• Best quality/time ratio: {self._find_best_quality_time_ratio(results)}
+• Best quality/time ratio: {best_ratio_str}
             """.strip()
 
             analysis_panel = Panel(
@@ -899,12 +1600,9 @@ class VideoCompressor:
 
     def _display_benchmark_analysis_simple(self, results):
         """Display simple benchmark analysis"""
-        gpu_results = [r for r in results if r['gpu']]
-        cpu_results = [r for r in results if not r['gpu']]
+        fastest_gpu, fastest_cpu, _ = self._summarize(results)
 
-        if gpu_results and cpu_results:
-            fastest_gpu = min(gpu_results, key=lambda x: x['time'])
-            fastest_cpu = min(cpu_results, key=lambda x: x['time'])
+        if fastest_gpu and fastest_cpu:
             gpu_speedup = fastest_cpu['time'] / fastest_gpu['time']
 
             print(f"\n📊 Analysis:")
@@ -912,60 +1610,120 @@ class VideoCompressor:
             print(f"Fastest CPU: {fastest_cpu['description']} ({fastest_cpu['time']:.1f}s)")
             print(f"GPU Speedup: {gpu_speedup:.1f}x faster")
 
-    def _find_best_quality_time_ratio(self, results):
-        """Find the configuration with the best quality/time trade-off"""
-        quality_scores = {'low': 1, 'medium': 2, 'high': 3}
-        best_ratio = 0
-        best_config = None
+    def _can_concat(self, jobs, infos):
+        """Whether a batch can go through the concat demuxer as one stream
 
-        for result in results:
-            quality_score = quality_scores.get(result['quality'], 2)
-            ratio = quality_score / result['time']  # Higher is better
+        The demuxer takes stream parameters from the first clip, so every clip needs the
+        same container, size, codec, pixel format and frame rate, the same audio codec,
+        sample rate and channel count, plus a known duration to cut at.
+        """
+        if len(jobs) < 2 or None in infos:
+            return False
+        layouts = {(info['width'], info['height'], info['codec'], info['pix_fmt'], round(info['fps'], 3),
+                    info['audio_codec'], info['sample_rate'], info['channels'])
+                   for info in infos}
+        suffixes = {input_path.suffix.lower() for input_path, _, _, _ in jobs}
+        return len(layouts) == 1 and len(suffixes) == 1 and all(info['duration'] > 0 for info in infos)
 
-            if ratio > best_ratio:
-                best_ratio = ratio
-                best_config = result
+    def _compress_concatenated(self, jobs, infos, quality, use_gpu):
+        """Encode same-format clips as one concatenated stream, then split it into one file per clip
 
-        return best_config['description'] if best_config else "Unknown"
+        Starts ffmpeg and initializes the encoder once for the whole batch, which is most
+        of the cost for short clips. Returns True only if every output was written.
+        """
+        encoder = self._get_gpu_encoder() if use_gpu else None
+        durations = [info['duration'] for info in infos]
+        cut_times = ','.join(f'{cut:.3f}' for cut in itertools.accumulate(durations[:-1]))
+        output_dir = jobs[0][1].parent
+        suffix = jobs[0][0].suffix
+
+        with tempfile.TemporaryDirectory(dir=output_dir) as work_dir:
+            list_path = Path(work_dir) / 'inputs.txt'
+            # Concat lists quote paths in single quotes; an embedded quote is written as '\''
+            list_path.write_text(''.join(
+                "file '{}'\n".format(str(input_path.resolve()).replace("'", "'\\''"))
+                for input_path, _, _, _ in jobs
+            ), encoding='utf-8')
+
+            cmd = self._build_concat_cmd(list_path, Path(work_dir) / f'%04d{suffix}', quality, infos[0],
+                                         encoder, cut_times)
+            if not self._run_ffmpeg(cmd, sum(durations), f"{len(jobs)} clips (concat)"):
+                return False
+
+            # A cut the muxer missed merges two clips, so never map segments to outputs unless
+            # there is exactly one per clip
+            segments = sorted(Path(work_dir).glob(f'*{suffix}'))
+            if len(segments) != len(jobs):
+                self._print(f"⚠️ Concatenated encode split into {len(segments)} pieces instead of {len(jobs)}",
+                            style="yellow")
+                return False
+            for segment, (_, output_path, _, _) in zip(segments, jobs):
+                os.replace(segment, output_path)
+
+        # Same per-file report (and Discord size check) as a normal encode
+        for input_path, output_path, _, _ in jobs:
+            self.analyze_result(input_path, output_path)
+        return True
 
-    def compress_multiple_videos(self, input_paths: List[str], output_dir: str, quality: str = "medium", use_gpu=False):
-        """Batch compress multiple videos with progress tracking"""
+    def compress_multiple_videos(self, input_paths: List[str], output_dir: str, quality: str = "medium", use_gpu=False,
+                                 max_parallel=None, concat=False, allow_copy=False):
+        """Batch compress multiple videos, running several encodes at once
+
+        With `concat`, clips that share one format are encoded by a single FFmpeg run
+        instead (falling back to one encode per file when they don't, or if it fails).
+        `allow_copy` lets per-file encodes remux sources already under the target.
+        """
         import time
         batch_start_time = time.time()
 
         output_dir = Path(output_dir)
         output_dir.mkdir(exist_ok=True)
 
+        if max_parallel is None:
+            # x264 scales well up to ~4 threads per encode; GPUs get their own session budget
+            max_parallel = self._gpu_batch_parallelism() if use_gpu else max(1, (os.cpu_count() or 1) // 4)
+
         successful = []
         failed = []
+        jobs = []
+        stats = []
 
-        if RICH_AVAILABLE:
-            self.console.print(f"🚀 Starting batch compression of {len(input_paths)} videos...", style="bold cyan")
-        else:
-            print(f"🚀 Starting batch compression of {len(input_paths)} videos...")
+        self._print(f"🚀 Starting batch compression of {len(input_paths)} videos...", style="bold cyan")
 
-        for i, input_path in enumerate(input_paths, 1):
+        for input_path in input_paths:
             input_path = Path(input_path)
-            if not input_path.exists():
-                failed.append((str(input_path), "File not found"))
+            try:
+                st = os.stat(input_path)
+            except OSError as e:
+                failed.append((str(input_path), "File not found" if isinstance(e, FileNotFoundError) else e.strerror))
                 continue
 
             gpu_suffix = "_gpu" if use_gpu else ""
             output_path = output_dir / f"{input_path.stem}_compressed{gpu_suffix}{input_path.suffix}"
+            jobs.append((input_path, output_path, quality, use_gpu))
+            stats.append(st)
 
-            if RICH_AVAILABLE:
-                self.console.print(f"\n📹 Processing {i}/{len(input_paths)}: {input_path.name}", style="bold blue")
+        infos = self._probe_all([input_path for input_path, _, _, _ in jobs], stats)
+
+        results = None
+        if concat and quality in _QUALITY_SETTINGS:
+            if not self._can_concat(jobs, infos):
+                self._print("⚠️ Clips differ in format, encoding them one by one", style="yellow")
+            elif self._compress_concatenated(jobs, infos, quality, use_gpu):
+                results = [(True, 0, None)] * len(jobs)
             else:
-                print(f"\n📹 Processing {i}/{len(input_paths)}: {input_path.name}")
+                self._print("⚠️ Concatenated encode failed, encoding clips one by one", style="yellow")
 
-            try:
-                success = self.compress_video(input_path, output_path, quality, use_gpu)
-                if success:
-                    successful.append(str(output_path))
-                else:
-                    failed.append((str(input_path), "Compression failed"))
-            except Exception as e:
-                failed.append((str(input_path), str(e)))
+        if results is None:
+            if len(jobs) > 1 and max_parallel > 1:
+                self._print(f"⚡ Running up to {min(max_parallel, len(jobs))} encodes in parallel", style="cyan")
+            results = self._run_jobs(jobs, max_parallel, allow_copy=allow_copy)
+
+        for (input_path, output_path, _, _), (success, _, error) in zip(jobs, results):
+            if success:
+                successful.append(str(output_path))
+            else:
+                failed.append((str(input_path), error or "Compression failed"))
 
         # Calculate and display batch timing
         batch_end_time = time.time()
@@ -977,73 +1735,72 @@ class VideoCompressor:
 
     def _show_batch_results(self, successful: List[str], failed: List[tuple], batch_elapsed_time=None, use_gpu=False):
         """Display batch processing results with timing"""
-        if RICH_AVAILABLE:
-            # Build results text with timing
-            results_text = (
-                f"✅ Successfully compressed: {len(successful)} videos\n" +
-                f"❌ Failed: {len(failed)} videos\n" +
-                f"🎯 Success rate: {len(successful)/(len(successful)+len(failed))*100:.1f}%"
-            )
+        total_files = len(successful) + len(failed)
+        lines = [
+            f"✅ Successfully compressed: {len(successful)} videos",
+            f"❌ Failed: {len(failed)} videos"
+        ]
+        if total_files:
+            lines.append(f"🎯 Success rate: {len(successful) / total_files * 100:.1f}%")
 
-            # Add timing information if available
-            if batch_elapsed_time:
-                minutes = int(batch_elapsed_time // 60)
-                seconds = batch_elapsed_time % 60
-                time_str = f"{minutes}m {seconds:.1f}s" if minutes > 0 else f"{seconds:.1f}s"
-                encoding_type = "GPU" if use_gpu else "CPU"
-
-                # Calculate average time per file
-                total_files = len(successful) + len(failed)
-                if total_files > 0:
-                    avg_time_per_file = batch_elapsed_time / total_files
-                    avg_str = f"{avg_time_per_file:.1f}s" if avg_time_per_file < 60 else f"{int(avg_time_per_file // 60)}m {avg_time_per_file % 60:.1f}s"
-
-                    results_text += (
-                        f"\n⏱️ Total time: {time_str}\n" +
-                        f"🖥️ Encoding: {encoding_type}\n" +
-                        f"📈 Avg per file: {avg_str}"
-                    )
+        # Parallel encodes skip the per-file results table, so every output's Discord check
+        # is reported here: (name, size in MB, MB over the limit)
+        outputs = []
+        for output_path in successful:
+            try:
+                output_size = os.stat(output_path).st_size
+            except OSError:
+                continue
+            outputs.append((Path(output_path).name, output_size / (1024 * 1024),
+                            (output_size - self.discord_max_size_bytes) / (1024 * 1024)))
+        over_limit_count = sum(1 for _, _, over_limit in outputs if over_limit > 0)
+        if over_limit_count:
+            lines.append(f"⚠️ Over Discord's {self.discord_max_size_mb}MB limit: {over_limit_count} "
+                         f"(try 'low' or 'potato' quality)")
+
+        # Add timing information if available
+        if batch_elapsed_time:
+            lines.append(f"⏱️ Total time: {self._fmt_hms(batch_elapsed_time)}")
+            lines.append(f"🖥️ Encoding: {'GPU' if use_gpu else 'CPU'}")
+            if total_files:
+                lines.append(f"📈 Avg per file: {self._fmt_hms(batch_elapsed_time / total_files)}")
 
+        if RICH_AVAILABLE:
             results_panel = Panel(
-                results_text,
+                "\n".join(lines),
                 title="📊 Batch Processing Results",
                 border_style="green" if len(failed) == 0 else "yellow"
             )
             self.console.print(results_panel)
 
+            if outputs:
+                output_table = Table(title="📦 Compressed Files", show_header=True)
+                output_table.add_column("File", style="cyan")
+                output_table.add_column("Size", style="green")
+                output_table.add_column("🎯 Discord Ready")
+                for name, output_mb, over_limit in outputs:
+                    output_table.add_row(escape(name), f"{output_mb:.1f} MB",
+                                         f"⚠️ NO - {over_limit:.1f}MB over limit" if over_limit > 0 else "✅ YES")
+                self.console.print(output_table)
+
             if failed:
                 error_table = Table(title="❌ Failed Files", show_header=True)
                 error_table.add_column("File", style="red")
                 error_table.add_column("Error", style="yellow")
                 for file_path, error in failed:
-                    error_table.add_row(Path(file_path).name, error)
+                    error_table.add_row(escape(Path(file_path).name), escape(error))
                 self.console.print(error_table)
         else:
             print(f"\n📊 Batch Processing Results:")
-            print(f"✅ Successfully compressed: {len(successful)} videos")
-            print(f"❌ Failed: {len(failed)} videos")
-
-            # Add timing information if available
-            if batch_elapsed_time:
-                minutes = int(batch_elapsed_time // 60)
-                seconds = batch_elapsed_time % 60
-                time_str = f"{minutes}m {seconds:.1f}s" if minutes > 0 else f"{seconds:.1f}s"
-                encoding_type = "GPU" if use_gpu else "CPU"
-
-                print(f"⏱️ Total time: {time_str}")
-                print(f"🖥️ Encoding: {encoding_type}")
-
-                # Calculate average time per file
-                total_files = len(successful) + len(failed)
-                if total_files > 0:
-                    avg_time_per_file = batch_elapsed_time / total_files
-                    avg_str = f"{avg_time_per_file:.1f}s" if avg_time_per_file < 60 else f"{int(avg_time_per_file // 60)}m {avg_time_per_file % 60:.1f}s"
-                    print(f"📈 Avg per file: {avg_str}")
+            print("\n".join(lines))
+
+            for name, output_mb, over_limit in outputs:
+                verdict = f"⚠️ {over_limit:.1f}MB over Discord's limit" if over_limit > 0 else "✅ Discord ready"
+                print(f"  📦 {name}: {output_mb:.1f} MB - {verdict}")
 
             if failed:
-                print(f"\n❌ Failed files:")
-                for file_path, error in failed:
-                    print(f"  - {Path(file_path).name}: {error}")
+                sys.stderr.write("\n❌ Failed files:\n" +
+                                 "".join(f"  - {Path(file_path).name}: {error}\n" for file_path, error in failed))
 
 
 def main():
@@ -1062,9 +1819,9 @@ Examples:
   python video_compressor.py input.mp4 --quality all
   python video_compressor.py input.mp4 output.mp4 --quality insane,potato
 
-  # GPU encoding (faster with supported hardware)
+  # GPU encoding is used automatically when a test encode works; pick either path yourself
   python video_compressor.py input.mp4 output.mp4 --gpu
-  python video_compressor.py input.mp4 --quality all --gpu
+  python video_compressor.py input.mp4 --quality all --cpu
 
   # Batch compression
   python video_compressor.py *.mp4 --batch --output-dir compressed/
@@ -1082,16 +1839,37 @@ Examples:
     parser.add_argument('files', nargs='*', help='Input video file path(s) and optional output path')
     parser.add_argument('--quality', default='medium',
                        help='Compression quality - single value, comma-separated list, or "all" for every quality (e.g., "medium", "high,low", or "all")')
+    parser.add_argument('--tune', choices=sorted(_X264_TUNES),
+                       help='x264 tuning for CPU encodes, matched to the content (e.g. film, animation, stillimage)')
     parser.add_argument('--batch', action='store_true', help='Batch process multiple files')
     parser.add_argument('--output-dir', help='Output directory for batch processing')
+    parser.add_argument('--workers', type=int, metavar='N',
+                       help='Files to encode at once in batch mode (default: 1 per 4 CPU cores, --gpu-concurrency on the GPU)')
+    parser.add_argument('--gpu-concurrency', type=int, default=2, metavar='N',
+                       help='GPU encodes to run at once in batch mode when --workers is not given (default: 2)')
+    parser.add_argument('--copy', action='store_true',
+                       help='Remux instead of re-encoding H.264 sources already under the target bitrate')
+    parser.add_argument('--concat', action='store_true',
+                       help='Batch mode: encode same-format clips in a single FFmpeg run (faster for many short clips)')
     parser.add_argument('--interactive', action='store_true', help='Launch interactive mode')
     parser.add_argument('--no-banner', action='store_true', help='Skip the cool banner')
-    parser.add_argument('--gpu', action='store_true', help='Enable GPU encoding (requires NVENC/VAAPI/VideoToolbox support)')
+    encoder_group = parser.add_mutually_exclusive_group()
+    encoder_group.add_argument('--gpu', action='store_true',
+                               help='Use the GPU encoder FFmpeg lists (NVENC/QSV/VAAPI/VideoToolbox) without the startup '
+                                    'test encode; falls back to CPU when none is listed')
+    encoder_group.add_argument('--cpu', action='store_true', help='Encode on the CPU even when a GPU encoder is available')
     parser.add_argument('--benchmark', action='store_true', help='Run benchmark tests comparing CPU vs GPU and different quality settings')
+    parser.add_argument('--verify-gpu', action='store_true', help='Run a short test encode before trusting a detected GPU encoder')
+    parser.add_argument('--verbose', action='store_true', help='Show the detected FFmpeg version at startup')
 
     args = parser.parse_args()
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.gpu_concurrency < 1:
+        parser.error("--gpu-concurrency must be at least 1")
 
-    compressor = VideoCompressor()
+    compressor = VideoCompressor(verify_gpu=args.verify_gpu, gpu_concurrency=args.gpu_concurrency)
+    compressor.tune = args.tune
 
     # Show cool banner unless disabled
     if not args.no_banner:
@@ -1099,17 +1877,27 @@ Examples:
         print()  # Add some space
 
     # Check if FFmpeg is available
-    if not compressor.check_ffmpeg():
+    if not compressor.check_ffmpeg(verbose=args.verbose):
         if RICH_AVAILABLE:
-            compressor.console.print("❌ Error: FFmpeg not found!", style="bold red")
-            compressor.console.print("Please install FFmpeg and make sure it's in your PATH", style="yellow")
-            compressor.console.print("Download from: https://ffmpeg.org/download.html", style="cyan")
+            compressor.console.print(Text.assemble(
+                ("❌ Error: FFmpeg not found!\n", "bold red"),
+                ("Please install FFmpeg (with ffprobe) and make sure it's in your PATH\n", "yellow"),
+                ("Download from: https://ffmpeg.org/download.html", "cyan")
+            ))
         else:
-            print("❌ Error: FFmpeg not found!")
-            print("Please install FFmpeg and make sure it's in your PATH")
-            print("Download from: https://ffmpeg.org/download.html")
+            sys.stderr.write(
+                "❌ Error: FFmpeg not found!\n"
+                "Please install FFmpeg (with ffprobe) and make sure it's in your PATH\n"
+                "Download from: https://ffmpeg.org/download.html\n"
+            )
         return 1
 
+    # Hardware encoding is the default when a GPU encoder passes a short test encode;
+    # builds list NVENC/QSV/VAAPI even on machines without the hardware
+    if not args.cpu and not args.gpu:
+        args.gpu = compressor._get_gpu_encoder(verify=True, quiet=True) is not None
+    compressor.prefer_gpu = args.gpu
+
     try:
         # Interactive mode
         if args.interactive:
@@ -1118,20 +1906,14 @@ Examples:
         # Benchmark mode
         if args.benchmark:
             if len(args.files) != 1:
-                if RICH_AVAILABLE:
-                    compressor.console.print("❌ Benchmark mode requires exactly one input file", style="bold red")
-                else:
-                    print("❌ Benchmark mode requires exactly one input file")
+                compressor._fail("❌ Benchmark mode requires exactly one input file", style="bold red")
                 return 1
 
             try:
                 compressor.run_benchmark(args.files[0])
                 return 0
             except Exception as e:
-                if RICH_AVAILABLE:
-                    compressor.console.print(f"❌ Benchmark error: {e}", style="bold red")
-                else:
-                    print(f"❌ Benchmark error: {e}")
+                compressor._fail(f"❌ Benchmark error: {e}", style="bold red")
                 return 1
 
         # Expand glob patterns in file arguments
@@ -1142,15 +1924,9 @@ Examples:
                 matches = glob.glob(file_pattern)
                 if matches:
                     expanded_files.extend(matches)
-                    if RICH_AVAILABLE:
-                        compressor.console.print(f"🔍 Expanded '{file_pattern}' to {len(matches)} files", style="cyan")
-                    else:
-                        print(f"🔍 Expanded '{file_pattern}' to {len(matches)} files")
+                    compressor._print(f"🔍 Expanded '{file_pattern}' to {len(matches)} files", style="cyan")
                 else:
-                    if RICH_AVAILABLE:
-                        compressor.console.print(f"⚠️ No files matched pattern: {file_pattern}", style="yellow")
-                    else:
-                        print(f"⚠️ No files matched pattern: {file_pattern}")
+                    compressor._print(f"⚠️ No files matched pattern: {file_pattern}", style="yellow")
             else:
                 expanded_files.append(file_pattern)
 
@@ -1159,7 +1935,7 @@ Examples:
 
         # Parse quality argument - check if comma-separated or "all"
         if args.quality.lower().strip() == 'all':
-            qualities = ['insane', 'high', 'medium', 'low', 'potato']
+            qualities = list(_QUALITY_SETTINGS)
         else:
             qualities = [q.strip() for q in args.quality.split(',') if q.strip()]
 
@@ -1169,40 +1945,28 @@ Examples:
 
             # If multiple qualities specified, ignore output_file and use multiple quality mode
             if len(qualities) > 1:
-                if RICH_AVAILABLE:
-                    compressor.console.print(f"🎯 Multiple qualities detected: {', '.join(qualities)}", style="cyan")
-                    compressor.console.print(f"📁 Output file '{output_file}' ignored, using quality-based naming", style="yellow")
-                else:
-                    print(f"🎯 Multiple qualities detected: {', '.join(qualities)}")
-                    print(f"📁 Output file '{output_file}' ignored, using quality-based naming")
+                compressor._print(f"🎯 Multiple qualities detected: {', '.join(qualities)}", style="cyan")
+                compressor._print(f"📁 Output file '{output_file}' ignored, using quality-based naming", style="yellow")
 
                 successful, failed = compressor.compress_video_multiple_qualities(input_file, qualities, args.gpu)
-                if RICH_AVAILABLE:
-                    compressor.console.print(f"\n📊 Results: {len(successful)} successful, {len(failed)} failed", style="bold green")
-                else:
-                    print(f"\n📊 Results: {len(successful)} successful, {len(failed)} failed")
+                compressor._print(f"\n📊 Results: {len(successful)} successful, {len(failed)} failed", style="bold green")
                 return 0 if len(failed) == 0 else 1
             else:
-                success = compressor.compress_video(input_file, output_file, qualities[0], args.gpu)
+                success = compressor.compress_video(input_file, output_file, qualities[0], args.gpu,
+                                                    allow_copy=args.copy)
                 return 0 if success else 1
 
         # Batch processing mode
         elif args.batch or len(args.files) > 2:
             if not args.output_dir:
                 output_dir = "compressed_videos"
-                if RICH_AVAILABLE:
-                    compressor.console.print(f"📁 No output directory specified, using: {output_dir}", style="yellow")
-                else:
-                    print(f"📁 No output directory specified, using: {output_dir}")
+                compressor._print(f"📁 No output directory specified, using: {output_dir}", style="yellow")
             else:
                 output_dir = args.output_dir
 
             # Handle multiple qualities in batch mode
             if len(qualities) > 1:
-                if RICH_AVAILABLE:
-                    compressor.console.print(f"🎯 Multiple qualities detected for batch processing: {', '.join(qualities)}", style="cyan")
-                else:
-                    print(f"🎯 Multiple qualities detected for batch processing: {', '.join(qualities)}")
+                compressor._print(f"🎯 Multiple qualities detected for batch processing: {', '.join(qualities)}", style="cyan")
 
                 all_successful = []
                 all_failed = []
@@ -1212,13 +1976,12 @@ Examples:
                     all_successful.extend(successful)
                     all_failed.extend(failed)
 
-                if RICH_AVAILABLE:
-                    compressor.console.print(f"\n📊 Batch Results: {len(all_successful)} successful, {len(all_failed)} failed", style="bold green")
-                else:
-                    print(f"\n📊 Batch Results: {len(all_successful)} successful, {len(all_failed)} failed")
+                compressor._print(f"\n📊 Batch Results: {len(all_successful)} successful, {len(all_failed)} failed", style="bold green")
                 return 0 if len(all_failed) == 0 else 1
             else:
-                successful, failed = compressor.compress_multiple_videos(args.files, output_dir, qualities[0], args.gpu)
+                successful, failed = compressor.compress_multiple_videos(args.files, output_dir, qualities[0], args.gpu,
+                                                                     max_parallel=args.workers, concat=args.concat,
+                                                                     allow_copy=args.copy)
                 return 0 if failed == 0 else 1
 
         # Single input file, no output specified - generate output name
@@ -1227,55 +1990,35 @@ Examples:
 
             # If multiple qualities specified, use multiple quality mode
             if len(qualities) > 1:
-                if RICH_AVAILABLE:
-                    compressor.console.print(f"🎯 Multiple qualities detected: {', '.join(qualities)}", style="cyan")
-                else:
-                    print(f"🎯 Multiple qualities detected: {', '.join(qualities)}")
+                compressor._print(f"🎯 Multiple qualities detected: {', '.join(qualities)}", style="cyan")
 
                 successful, failed = compressor.compress_video_multiple_qualities(input_file, qualities, args.gpu)
-                if RICH_AVAILABLE:
-                    compressor.console.print(f"\n📊 Results: {len(successful)} successful, {len(failed)} failed", style="bold green")
-                else:
-                    print(f"\n📊 Results: {len(successful)} successful, {len(failed)} failed")
+                compressor._print(f"\n📊 Results: {len(successful)} successful, {len(failed)} failed", style="bold green")
                 return 0 if len(failed) == 0 else 1
             else:
                 input_path = Path(input_file)
                 gpu_suffix = "_gpu" if args.gpu else ""
-                output_file = str(input_path.with_stem(f"{input_path.stem}_compressed{gpu_suffix}").with_suffix('.mp4'))
+                output_file = str(input_path.parent / f"{input_path.stem}_compressed{gpu_suffix}.mp4")
 
-                if RICH_AVAILABLE:
-                    compressor.console.print(f"📁 No output specified, using: {output_file}", style="yellow")
-                else:
-                    print(f"📁 No output specified, using: {output_file}")
+                compressor._print(f"📁 No output specified, using: {output_file}", style="yellow")
 
-                success = compressor.compress_video(input_file, output_file, qualities[0], args.gpu)
+                success = compressor.compress_video(input_file, output_file, qualities[0], args.gpu,
+                                                    allow_copy=args.copy)
                 return 0 if success else 1
 
         else:
-            if RICH_AVAILABLE:
-                compressor.console.print("❌ No input files specified. Use --help for usage information.", style="bold red")
-            else:
-                print("❌ No input files specified. Use --help for usage information.")
+            compressor._fail("❌ No input files specified. Use --help for usage information.", style="bold red")
             parser.print_help()
             return 1
 
     except FileNotFoundError as e:
-        if RICH_AVAILABLE:
-            compressor.console.print(f"❌ Error: {e}", style="bold red")
-        else:
-            print(f"❌ Error: {e}")
+        compressor._fail(f"❌ Error: {e}", style="bold red")
         return 1
     except KeyboardInterrupt:
-        if RICH_AVAILABLE:
-            compressor.console.print("\n⏹️ Compression cancelled by user", style="bold yellow")
-        else:
-            print("\n⏹️ Compression cancelled by user")
+        compressor._print("\n⏹️ Compression cancelled by user", style="bold yellow")
         return 1
     except Exception as e:
-        if RICH_AVAILABLE:
-            compressor.console.print(f"❌ Unexpected error: {e}", style="bold red")
-        else:
-            print(f"❌ Unexpected error: {e}")
+        compressor._fail(f"❌ Unexpected error: {e}", style="bold red")
         return 1
 
 
@@ -1288,20 +2031,21 @@ def run_interactive_mode(compressor):
 
     console = compressor.console
 
+    # The menu never changes, so build it once and just re-print it each round
+    menu = Table(title="🎮 Interactive Mode", show_header=False, box=None)
+    menu.add_column("Option", style="cyan", width=3)
+    menu.add_column("Description", style="white")
+
+    menu.add_row("1.", "🎬 Compress single video")
+    menu.add_row("2.", "📚 Batch compress multiple videos")
+    menu.add_row("3.", "⚙️ Quality settings info")
+    menu.add_row("4.", "📊 File size calculator")
+    menu.add_row("q.", "🚪 Quit")
+
     while True:
         console.clear()
 
         # Show interactive menu
-        menu = Table(title="🎮 Interactive Mode", show_header=False, box=None)
-        menu.add_column("Option", style="cyan", width=3)
-        menu.add_column("Description", style="white")
-
-        menu.add_row("1.", "🎬 Compress single video")
-        menu.add_row("2.", "📚 Batch compress multiple videos")
-        menu.add_row("3.", "⚙️ Quality settings info")
-        menu.add_row("4.", "📊 File size calculator")
-        menu.add_row("q.", "🚪 Quit")
-
         console.print(menu)
 
         choice = input("\n🎯 Choose an option: ").strip().lower()
@@ -1314,7 +2058,7 @@ def run_interactive_mode(compressor):
             show_quality_info(compressor)
         elif choice == '4':
             run_size_calculator(compressor)
-        elif choice in ['q', 'quit', 'exit']:
+        elif choice in _MENU_QUIT:
             console.print("👋 Thanks for using Ultra Cool Video Compressor!", style="bold green")
             return 0
         else:
@@ -1322,6 +2066,17 @@ def run_interactive_mode(compressor):
             input("Press Enter to continue...")
 
 
+def _ask_tune(compressor):
+    """Prompt for an x264 -tune value; blank or unknown answers keep x264's default"""
+    tune = input("🎛️ Tune [none/film/animation/stillimage/zerolatency]: ").strip().lower()
+    if tune in ('', 'none'):
+        return None
+    if tune not in _X264_TUNES:
+        compressor._print(f"⚠️ Unknown tune '{tune}', using x264's default", style="yellow")
+        return None
+    return tune
+
+
 def run_single_file_interactive(compressor):
     """Interactive single file compression"""
     console = compressor.console
@@ -1344,36 +2099,66 @@ def run_single_file_interactive(compressor):
     }.items():
         console.print(f"  {quality}: {settings}")
 
-    quality = input("\n🎲 Choose quality [medium]: ").strip().lower() or "medium"
+    quality = _ask_quality(compressor, "\n🎲 Choose quality [medium]: ")
+    compressor.tune = _ask_tune(compressor)
 
     try:
-        success = compressor.compress_video(input_file, output_file, quality)
+        success = compressor.compress_video(input_file, output_file, quality, compressor.prefer_gpu)
         if success:
             console.print("\n🎉 Compression completed successfully!", style="bold green")
         else:
             console.print("\n❌ Compression failed.", style="bold red")
     except Exception as e:
-        console.print(f"\n❌ Error: {e}", style="bold red")
+        console.print(f"\n❌ Error: {e}", style="bold red", markup=False)
 
     input("\nPress Enter to continue...")
 
 
+def _read_batch_paths(prompt):
+    """Read batch input paths until an empty line
+
+    Each line may hold several comma-separated paths or globs (`*.mp4`), so a whole
+    folder takes one prompt and a pasted list of paths is read line by line.
+    """
+    paths = []
+    while True:
+        line = input(prompt).strip()
+        if not line:
+            return list(dict.fromkeys(paths))  # a file matched twice is still encoded once
+        # A line that is itself an existing path may contain commas of its own
+        entries = [line.strip('"')] if os.path.exists(line.strip('"')) else line.split(',')
+        for entry in entries:
+            entry = entry.strip().strip('"')
+            if any(char in entry for char in '*?['):
+                paths.extend(sorted(glob.iglob(entry)))
+            elif entry:
+                paths.append(entry)
+
+
+def _ask_quality(compressor, prompt):
+    """Prompt for a quality preset; blank or unknown answers use medium"""
+    quality = input(prompt).strip().lower() or "medium"
+    if quality not in _QUALITIES:
+        compressor._print(f"⚠️ Unknown quality '{quality}', using medium", style="yellow")
+        quality = "medium"
+    return quality
+
+
 def run_batch_interactive(compressor):
     """Interactive batch processing"""
     console = compressor.console
 
     console.print("📚 Batch Processing Mode", style="bold cyan")
-    console.print("Enter video file paths (one per line, empty line to finish):")
+    console.print("Enter video paths or globs like *.mp4 (comma-separated or one per line, empty line to finish):")
 
     input_files = []
-    while True:
-        file_path = input(f"📁 File {len(input_files)+1}: ").strip().strip('"')
-        if not file_path:
-            break
-        if Path(file_path).exists():
+    for file_path in _read_batch_paths("📁 Files: "):
+        if os.path.exists(file_path):
             input_files.append(file_path)
         else:
-            console.print("⚠️ File not found, skipping...", style="yellow")
+            console.print(f"⚠️ File not found, skipping {file_path}", style="yellow", markup=False)
+    if input_files:
+        console.print(f"📚 {len(input_files)} files queued", style="cyan")
 
     if not input_files:
         console.print("❌ No valid files provided.", style="bold red")
@@ -1381,13 +2166,17 @@ def run_batch_interactive(compressor):
         return
 
     output_dir = input("📂 Output directory [./compressed]: ").strip() or "./compressed"
-    quality = input("🎲 Quality [medium]: ").strip().lower() or "medium"
+    workers = input("⚙️ Parallel encodes [auto]: ").strip()
+    max_parallel = int(workers) if workers.isdigit() and int(workers) > 0 else None
+    quality = _ask_quality(compressor, "🎲 Quality [medium]: ")
+    compressor.tune = _ask_tune(compressor)
 
     try:
-        successful, failed = compressor.compress_multiple_videos(input_files, output_dir, quality)
+        successful, failed = compressor.compress_multiple_videos(input_files, output_dir, quality, compressor.prefer_gpu,
+                                                                 max_parallel=max_parallel)
         console.print(f"\n📊 Results: {successful} successful, {failed} failed", style="bold green")
     except Exception as e:
-        console.print(f"\n❌ Error: {e}", style="bold red")
+        console.print(f"\n❌ Error: {e}", style="bold red", markup=False)
 
     input("\nPress Enter to continue...")
 
@@ -1429,7 +2218,9 @@ def run_size_calculator(compressor):
     console = compressor.console
 
     file_path = input("📂 Enter video file path: ").strip().strip('"')
-    if not Path(file_path).exists():
+    try:
+        file_size = os.stat(file_path).st_size
+    except FileNotFoundError:
         console.print("❌ File not found!", style="bold red")
         input("Press Enter to continue...")
         return
@@ -1437,7 +2228,7 @@ def run_size_calculator(compressor):
     console.print("\n🔍 Analyzing video...", style="cyan")
 
     # Get file info
-    file_size_mb = Path(file_path).stat().st_size / (1024 * 1024)
+    file_size_mb = file_size / (1024 * 1024)
     video_info = compressor._extract_video_info(file_path)
 
     if video_info:
@@ -1493,28 +2284,29 @@ def run_basic_interactive_mode(compressor):
         if choice == '1':
             input_file = input("📂 Enter input video path: ").strip().strip('"')
             output_file = input("💾 Enter output path: ").strip().strip('"')
-            quality = input("🎲 Quality [medium]: ").strip().lower() or "medium"
+            quality = _ask_quality(compressor, "🎲 Quality [medium]: ")
+            compressor.tune = _ask_tune(compressor)
 
             try:
-                success = compressor.compress_video(input_file, output_file, quality)
+                success = compressor.compress_video(input_file, output_file, quality, compressor.prefer_gpu)
                 print("\n🎉 Done!" if success else "\n❌ Failed!")
             except Exception as e:
                 print(f"\n❌ Error: {e}")
 
         elif choice == '2':
-            print("📚 Enter video files (empty line to finish):")
-            files = []
-            while True:
-                file_path = input(f"File {len(files)+1}: ").strip().strip('"')
-                if not file_path:
-                    break
-                files.append(file_path)
+            print("📚 Enter video paths or globs like *.mp4 (comma-separated or one per line, empty line to finish):")
+            files = _read_batch_paths("Files: ")
 
             if files:
                 output_dir = input("Output directory [./compressed]: ").strip() or "./compressed"
-                quality = input("Quality [medium]: ").strip().lower() or "medium"
+                workers = input("Parallel encodes [auto]: ").strip()
+                max_parallel = int(workers) if workers.isdigit() and int(workers) > 0 else None
+                quality = _ask_quality(compressor, "Quality [medium]: ")
+                compressor.tune = _ask_tune(compressor)
                 try:
-                    successful, failed = compressor.compress_multiple_videos(files, output_dir, quality)
+                    successful, failed = compressor.compress_multiple_videos(files, output_dir, quality,
+                                                                             compressor.prefer_gpu,
+                                                                             max_parallel=max_parallel)
                     print(f"\n📊 Results: {successful} successful, {failed} failed")
                 except Exception as e:
                     print(f"\n❌ Error: {e}")
@@ -1527,7 +2319,7 @@ def run_basic_interactive_mode(compressor):
             print("  low:    🚀 Speed focus (smaller files)")
             print("  potato: 🥔 Maximum compression (smallest)")
 
-        elif choice in ['q', 'quit', 'exit']:
+        elif choice in _MENU_QUIT:
             print("👋 Thanks for using Ultra Cool Video Compressor!")
             return 0
         else: